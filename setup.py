@@ -214,6 +214,8 @@ setup(
     # Similar to `install_requires` above, these must be valid existing
     # projects.
     extras_require={
+        "msgpack": ["msgpack"],
+        "zstd": ["zstandard"],
         "dev": [
             "appdirs==1.4.4",
             "atomicwrites==1.4.0; sys_platform == 'win32'",
@@ -11,32 +11,42 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
+import hashlib
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from datetime import datetime, timedelta
 
 from braket.device_schema.device_service_properties_v1 import DeviceCost
 from typing import List, Dict, Optional, Any, Union, Tuple
 
+from botocore.exceptions import ClientError
 from botocore.response import StreamingBody
 from braket.aws import AwsDevice, AwsQuantumTask, AwsSession
 from braket.circuits import Circuit
-from braket.device_schema import DeviceCapabilities
-from braket.device_schema.ionq import IonqDeviceCapabilities
-from braket.device_schema.rigetti import RigettiDeviceCapabilities
-from braket.device_schema.simulators import GateModelSimulatorDeviceCapabilities
+from braket.device_schema import DeviceCapabilities, GateModelParameters
+from braket.device_schema.ionq import IonqDeviceCapabilities, IonqDeviceParameters
+from braket.device_schema.rigetti import RigettiDeviceCapabilities, RigettiDeviceParameters
+from braket.device_schema.simulators import GateModelSimulatorDeviceCapabilities, GateModelSimulatorDeviceParameters
 from qiskit.providers import BaseBackend, JobStatus
 from qiskit.providers.models import QasmBackendConfiguration, BackendProperties, BackendStatus
 from qiskit.qobj import QasmQobj
 
 from . import awsjob
 from . import awsprovider
+from . import serialization
 from .conversions_configuration import aws_device_2_configuration
+from .jobindex import JobIndex, FINAL_JOB_STATES
 from .conversions_properties import aws_ionq_to_properties, aws_rigetti_to_properties, aws_simulator_to_properties
-from .transpilation import convert_qasm_qobj
+from .transpilation import convert_qasm_qobj, convert_qasm_qobj_jaqcd, JaqcdProgram
 
 logger = logging.getLogger(__name__)
 
+# Version of the job manifest format written by AWSBackend.run, readers accept this version and below
+_JOB_MANIFEST_VERSION = 1
+# No extension: the manifest is written with the provider's codec (gzip compressed json by default)
+_JOB_MANIFEST_FILE = 'job_manifest'
+
 
 class AWSBackend(BaseBackend):
 
@@ -44,10 +54,9 @@ class AWSBackend(BaseBackend):
     _configuration: QasmBackendConfiguration
     _provider: 'awsprovider.AWSProvider'
 
-    def __init__(self, aws_device: AwsDevice, provider: 'awsprovider.AWSProvider' = None):
-        super().__init__(aws_device_2_configuration(aws_device), provider)
+    def __init__(self, aws_device: AwsDevice, provider: 'awsprovider.AWSProvider' = None, native_gates: bool = False):
+        super().__init__(aws_device_2_configuration(aws_device, native_gates=native_gates), provider)
         self._aws_device = aws_device
-        self._run = aws_device.run
 
     def properties(self) -> BackendProperties:
         properties: DeviceCapabilities = self._aws_device.properties
@@ -79,109 +88,103 @@ class AWSBackend(BaseBackend):
             backend_status.operational = False
         return backend_status
 
+    def _device_aws_session(self) -> AwsSession:
+        # The arns of QPUs have no region, the device's own session is one of the region the device is in
+        return self._aws_device._aws_session
+
     def _get_job_data_s3_folder(self, job_id):
         return f"results-{self.name()}-{job_id}"
 
     @staticmethod
     def _exists_file(s3_client, s3_bucket: str, file: str):
-        result: dict = s3_client.list_objects_v2(
-            Bucket=s3_bucket,
-            Prefix=file
-        )
-        # TODO: error handling
-        return result['KeyCount'] != 0
+        try:
+            s3_client.head_object(Bucket=s3_bucket, Key=file)
+        except ClientError as ex:
+            if ex.response['Error']['Code'] in ['404', 'NoSuchKey', 'NotFound']:
+                return False
+            raise ex
+        return True
 
-    def _save_job_task_arns(self, job_id: str, task_arns: List[str],
-                            s3_bucket: Optional[str] = None) -> AwsSession.S3DestinationFolder:
-        used_s3_bucket = s3_bucket or self._provider.get_default_bucket()
-        s3_client = self._provider.get_s3_client()
-        file = f'{self._get_job_data_s3_folder(job_id=job_id)}/task_arns.json'
-        if AWSBackend._exists_file(s3_client, used_s3_bucket, file):
-            raise ValueError(f"An object '{file}' does already exist in the bucket {used_s3_bucket}")
-        result = s3_client.put_object(Body=json.dumps(task_arns).encode(), Bucket=used_s3_bucket, Key=file)
-        # TODO: error handling
-        return used_s3_bucket, self._get_job_data_s3_folder(job_id=job_id)
+    @staticmethod
+    def _put_file_if_absent(s3_client, s3_bucket: str, file: str, body: bytes):
+        put_object_shape = s3_client.meta.service_model.operation_model('PutObject').input_shape
+        if 'IfNoneMatch' in put_object_shape.members:
+            # a conditional write needs only one request
+            try:
+                s3_client.put_object(Body=body, Bucket=s3_bucket, Key=file, IfNoneMatch='*')
+            except ClientError as ex:
+                if ex.response['Error']['Code'] in ['PreconditionFailed', '412']:
+                    raise ValueError(f"An object '{file}' does already exist in the bucket {s3_bucket}")
+                raise ex
+        else:
+            # older botocore versions don't know about conditional writes, so we ask with a HEAD request first
+            if AWSBackend._exists_file(s3_client, s3_bucket, file):
+                raise ValueError(f"An object '{file}' does already exist in the bucket {s3_bucket}")
+            s3_client.put_object(Body=body, Bucket=s3_bucket, Key=file)
 
-    def _delete_job_task_arns(self, job_id: str, s3_bucket: Optional[str] = None):
-        used_s3_bucket = s3_bucket or self._provider.get_default_bucket()
-        s3_client = self._provider.get_s3_client()
-        file = f'{self._get_job_data_s3_folder(job_id=job_id)}/task_arns.json'
-        if not AWSBackend._exists_file(s3_client, used_s3_bucket, file):
-            raise ValueError(f"An object '{file}' does not exist in the bucket {used_s3_bucket}")
-        result: dict = s3_client.delete_object(Bucket=used_s3_bucket, Key=file)
-        # TODO: error handling
+    @staticmethod
+    def _get_file(s3_client, s3_bucket: str, file: str) -> bytes:
+        try:
+            result: dict = s3_client.get_object(Bucket=s3_bucket, Key=file)
+        except s3_client.exceptions.NoSuchKey:
+            raise ValueError(f"An object '{file}' does not exist in the bucket {s3_bucket}")
+        streaming_body: StreamingBody = result['Body']
+        return streaming_body.read()
 
+    # Only needed to read version 0 jobs, see _load_job_manifest_s3
     def _load_job_task_arns(self, job_id: str, s3_bucket: Optional[str] = None) -> List[str]:
         used_s3_bucket = s3_bucket or self._provider.get_default_bucket()
         s3_client = self._provider.get_s3_client()
         file = f'{self._get_job_data_s3_folder(job_id=job_id)}/task_arns.json'
-
-        if not AWSBackend._exists_file(s3_client, used_s3_bucket, file):
-            raise ValueError(f"An object '{file}' does not exist in the bucket {used_s3_bucket}")
-
-        result: dict = s3_client.get_object(Bucket=used_s3_bucket, Key=file)
-        # TODO: error handling
-        streaming_body: StreamingBody = result['Body']
-        data: bytes = streaming_body.read()
-        task_arns = json.loads(data.decode())
+        data: bytes = AWSBackend._get_file(s3_client, used_s3_bucket, file)
+        task_arns = serialization.decode(data)
         return task_arns
 
-    def _save_job_data_s3(self, qobj: QasmQobj, s3_bucket: Optional[str] = None,
-                          extra_data: Optional[dict] = None) -> AwsSession.S3DestinationFolder:
+    def _save_job_manifest_s3(self, job_id: str, manifest: dict, s3_bucket: Optional[str] = None,
+                              overwrite: bool = False) -> AwsSession.S3DestinationFolder:
         used_s3_bucket: str = s3_bucket or self._provider.get_default_bucket()
         s3_client = self._provider.get_s3_client()
-        file = f'{self._get_job_data_s3_folder(job_id=qobj.qobj_id)}/qiskit_qobj_data.json'
-        if AWSBackend._exists_file(s3_client, used_s3_bucket, file):
-            raise ValueError(f"An object '{file}' already exists at the bucket {used_s3_bucket}")
-
-        body = {
-            'qobj_id': qobj.qobj_id,
-            'qobj': qobj.to_dict()
-        }
-        if extra_data:
-            body['extra_data'] = extra_data
-
-        result = s3_client.put_object(Body=json.dumps(body).encode(), Bucket=used_s3_bucket, Key=file)
-        # TODO: error handling
-        return used_s3_bucket, self._get_job_data_s3_folder(job_id=qobj.qobj_id)
+        file = f'{self._get_job_data_s3_folder(job_id=job_id)}/{_JOB_MANIFEST_FILE}'
+        body = serialization.encode(manifest, self._provider.job_data_codec)
+        if overwrite:
+            s3_client.put_object(Body=body, Bucket=used_s3_bucket, Key=file)
+        else:
+            AWSBackend._put_file_if_absent(s3_client, used_s3_bucket, file, body)
+        return used_s3_bucket, self._get_job_data_s3_folder(job_id=job_id)
 
-    def _delete_job_data_s3(self, job_id: str, s3_bucket: Optional[str] = None):
+    def _delete_job_manifest_s3(self, job_id: str, s3_bucket: Optional[str] = None):
         used_s3_bucket = s3_bucket or self._provider.get_default_bucket()
         s3_client = self._provider.get_s3_client()
-        file = f'{self._get_job_data_s3_folder(job_id=job_id)}/qiskit_qobj_data.json'
-        if not AWSBackend._exists_file(s3_client, used_s3_bucket, file):
-            raise ValueError(f"An object '{file}' does not exist in the bucket {used_s3_bucket}")
-        result: dict = s3_client.delete_object(Bucket=used_s3_bucket, Key=file)
-        # TODO: error handling
+        file = f'{self._get_job_data_s3_folder(job_id=job_id)}/{_JOB_MANIFEST_FILE}'
+        s3_client.delete_object(Bucket=used_s3_bucket, Key=file)
 
-    def _load_job_data_s3(self, job_id: str, s3_bucket: Optional[str] = None) -> Tuple[QasmQobj, dict]:
+    def _load_job_manifest_s3(self, job_id: str, s3_bucket: Optional[str] = None) -> dict:
         used_s3_bucket = s3_bucket or self._provider.get_default_bucket()
         s3_client = self._provider.get_s3_client()
-        file = f'{self._get_job_data_s3_folder(job_id=job_id)}/qiskit_qobj_data.json'
-        if not AWSBackend._exists_file(s3_client, used_s3_bucket, file):
-            raise ValueError(f"An object '{file}' does not exist in the bucket {used_s3_bucket}")
-
-        result: dict = s3_client.get_object(Bucket=used_s3_bucket, Key=file)
-        # TODO: error handling
-
-        streaming_body: StreamingBody = result['Body']
-        data: bytes = streaming_body.read()
-        stored_experiment_data = json.loads(data.decode())
-        assert 'qobj' in stored_experiment_data
-        qobj_raw = stored_experiment_data['qobj']
-        qobj = QasmQobj.from_dict(qobj_raw)
-        extra_data = stored_experiment_data.get('extra_data', {})
-
-        return qobj, extra_data
-
-    def _create_task(self, job_id: str, qc: Circuit, shots: int, s3_bucket: Optional[str] = None) -> AwsQuantumTask:
-        used_s3_bucket: str = s3_bucket or self._provider.get_default_bucket()
-        task: AwsQuantumTask = self._aws_device.run(
-            task_specification=qc,
-            s3_destination_folder=(used_s3_bucket, self._get_job_data_s3_folder(job_id)),
-            shots=shots
-        )
-        return task
+        file = f'{self._get_job_data_s3_folder(job_id=job_id)}/{_JOB_MANIFEST_FILE}'
+        try:
+            data: bytes = AWSBackend._get_file(s3_client, used_s3_bucket, file)
+        except ValueError:
+            # Jobs from before the manifest was introduced: version 0 is made of qiskit_qobj_data.json and
+            # task_arns.json
+            folder = self._get_job_data_s3_folder(job_id=job_id)
+            stored_experiment_data = serialization.decode(
+                AWSBackend._get_file(s3_client, used_s3_bucket, f'{folder}/qiskit_qobj_data.json')
+            )
+            return {
+                'version': 0,
+                'job_id': job_id,
+                'qobj': stored_experiment_data['qobj'],
+                'extra_data': stored_experiment_data.get('extra_data', {}),
+                'task_arns': self._load_job_task_arns(job_id=job_id, s3_bucket=s3_bucket)
+            }
+        manifest: dict = serialization.decode(data)
+        if manifest.get('version', 0) > _JOB_MANIFEST_VERSION:
+            raise ValueError(f"The job manifest '{file}' has version {manifest.get('version')}, "
+                             f"only versions up to {_JOB_MANIFEST_VERSION} are supported.")
+        if manifest.get('submitting', False):
+            raise ValueError(f'The job {job_id} is still being submitted.')
+        return manifest
 
     def jobs(
             self,
@@ -196,41 +199,217 @@ class AWSBackend(BaseBackend):
             descending: bool = True,
             db_filter: Optional[Dict[str, Any]] = None
     ) -> List['awsjob.AWSJob']:
-        # TODO: use job tags as meta data on s3, else use the method of active_jobs
-        pass
-
-    def active_jobs(self, limit: int = 10) -> List['awsjob.AWSJob']:
-        client = self._provider._aws_session.braket_client
-        task_arns = []
-        nextToken = 'init'
-        while nextToken is not None:
+        # The jobs are searched in the local job index, see resync_job_index for jobs submitted elsewhere
+        job_index: Optional[JobIndex] = self._provider.job_index
+        if job_index is None:
+            raise ValueError('The provider has no job index, jobs can only be retrieved by their id.')
+        records = job_index.find_jobs(
+            backend_name=self.name(), limit=limit, skip=skip, status=status, job_name=job_name,
+            start_datetime=start_datetime, end_datetime=end_datetime, job_tags=job_tags,
+            job_tags_operator=job_tags_operator, descending=descending, db_filter=db_filter
+        )
+        return [self._job_from_index_record(record) for record in records]
+
+    def _job_from_index_record(self, record: Dict[str, Any]) -> 'awsjob.AWSJob':
+        # Everything but the manifest's data is in the index: its S3 object is only read once the job needs it, e.g.
+        # for the result, and the tasks are lazy as in retrieve_job
+        job_id: str = record['job_id']
+        s3_bucket: Optional[str] = record['s3_bucket']
+        return awsjob.AWSJob(
+            job_id=job_id,
+            qobj=None,
+            tasks=[awsjob.LazyQuantumTask(arn, self._provider.get_aws_session_for_arn) for arn in record['task_arns']],
+            s3_bucket=s3_bucket,
+            backend=self,
+            date_of_creation=record['creation_date'],
+            job_name=record['job_name'],
+            job_tags=record['job_tags'],
+            job_data_loader=lambda: self._job_data_from_manifest(self._load_job_manifest_s3(job_id, s3_bucket))
+        )
+
+    @staticmethod
+    def _job_data_from_manifest(manifest: dict) -> dict:
+        # The keyword arguments of AWSJob for the data in the job's manifest, the qobj is parsed when it is needed
+        qobj_dict: dict = manifest['qobj']
+        experiment_slices = [[awsjob.TaskSlice(*task_slice) for task_slice in slices]
+                             for slices in manifest['experiment_slices']] if 'experiment_slices' in manifest else None
+        return {
+            'qobj_loader': lambda: QasmQobj.from_dict(qobj_dict),
+            'extra_data': manifest.get('extra_data', {}),
+            'experiment_slices': experiment_slices,
+            'qubit_mapping': dict([(q, d) for q, d in manifest.get('qubit_mapping', [])])
+        }
+
+    def _search_quantum_tasks(self, state: str) -> List[dict]:
+        client = self._device_aws_session().braket_client
+        summaries: List[dict] = []
+        next_token: Optional[str] = None
+        while True:
+            kwargs = {'nextToken': next_token} if next_token else {}
             result: dict = client.search_quantum_tasks(
-                filters=[{
-                    'name': self.name(),
-                    'operator': 'EQUAL',
-                    'values': ['CREATED', 'QUEUED', 'RUNNING']
-                    }
+                filters=[
+                    {'name': 'deviceArn', 'operator': 'EQUAL', 'values': [self._aws_device.arn]},
+                    {'name': 'status', 'operator': 'EQUAL', 'values': [state]}
                 ],
-                maxResults=limit,
-                nextToken=None if nextToken == 'init' or nextToken is None else nextToken
+                maxResults=100,
+                **kwargs
             )
-            # TODO: build all task_arns, query s3 for all keys with task_arns.json, see to which task a job associated, load the jobs via job_id
-        pass
+            summaries += result.get('quantumTasks', [])
+            next_token = result.get('nextToken')
+            if next_token is None:
+                return summaries
+
+    def _job_id_of_task(self, task_summary: dict) -> Optional[str]:
+        # The tasks of a job write their results to '<job data folder>/<task id>', see run
+        prefix = self._get_job_data_s3_folder(job_id='')
+        folder = task_summary.get('outputS3Directory', '').split('/')[0]
+        return folder[len(prefix):] if folder.startswith(prefix) and len(folder) > len(prefix) else None
+
+    def queue_depth(self) -> int:
+        # The number of this account's tasks that wait on the device. Braket doesn't report the device's queue, so
+        # these are the only tasks ahead of a new one that are known.
+        waiting_states = ['CREATED', 'QUEUED']
+        with ThreadPoolExecutor(max_workers=len(waiting_states)) as executor:
+            return sum([len(summaries) for summaries in executor.map(self._search_quantum_tasks, waiting_states)])
+
+    def active_jobs(self, limit: int = 10, from_index: bool = False,
+                    max_workers: int = 10) -> List['awsjob.AWSJob']:
+        job_index: Optional[JobIndex] = self._provider.job_index
+        if from_index:
+            return self.jobs(limit=limit, status=[JobStatus.INITIALIZING, JobStatus.QUEUED, JobStatus.VALIDATING,
+                                                  JobStatus.RUNNING])
+
+        # every state is paged through on its own and at the same time
+        active_states = ['CREATED', 'QUEUED', 'RUNNING']
+        with ThreadPoolExecutor(max_workers=len(active_states)) as executor:
+            task_summaries = [t for summaries in executor.map(self._search_quantum_tasks, active_states)
+                              for t in summaries]
+        task_summaries = sorted(task_summaries, key=lambda t: t['createdAt'], reverse=True)
+
+        # Task arn -> job id from the job index, otherwise from the task's output folder (stored for next time)
+        task_job_ids = job_index.get_task_job_ids([t['quantumTaskArn'] for t in task_summaries]) if job_index else {}
+        new_task_job_ids = dict([(t['quantumTaskArn'], self._job_id_of_task(t)) for t in task_summaries
+                                 if t['quantumTaskArn'] not in task_job_ids])
+        new_task_job_ids = dict([(arn, job_id) for arn, job_id in new_task_job_ids.items() if job_id is not None])
+        if job_index and len(new_task_job_ids) > 0:
+            job_index.add_task_job_ids(new_task_job_ids)
+        task_job_ids.update(new_task_job_ids)
+
+        job_ids: List[str] = []
+        for task_summary in task_summaries:
+            job_id = task_job_ids.get(task_summary['quantumTaskArn'])
+            if job_id is not None and job_id not in job_ids:
+                job_ids.append(job_id)
+        job_ids = job_ids[:limit] if limit is not None else job_ids
+
+        buckets = dict([(task_job_ids[t['quantumTaskArn']], t['outputS3Bucket']) for t in task_summaries
+                        if t['quantumTaskArn'] in task_job_ids])
+        jobs = self._retrieve_jobs(job_ids, [buckets[job_id] for job_id in job_ids], max_workers=max_workers)
+        active_jobs: List[awsjob.AWSJob] = []
+        for job_id, job in zip(job_ids, jobs):
+            if isinstance(job, ValueError):
+                # no manifest (yet): the job is still being submitted, see run
+                logger.info(f'Skipping the active job {job_id}: {job}')
+            elif isinstance(job, Exception):
+                raise job
+            else:
+                active_jobs.append(job)
+        return active_jobs
+
+    def resync_job_index(self, s3_bucket: Optional[str] = None, max_workers: int = 10) -> List[str]:
+        # Adds all jobs of this backend that are stored in S3 but unknown to the job index, and refreshes the status
+        # of all jobs that are not in a final state. Returns the ids of the jobs that were updated.
+        job_index: Optional[JobIndex] = self._provider.job_index
+        if job_index is None:
+            raise ValueError('The provider has no job index.')
+        used_s3_bucket = s3_bucket or self._provider.get_default_bucket()
+        prefix = self._get_job_data_s3_folder(job_id='')
+        paginator = self._provider.get_s3_client().get_paginator('list_objects_v2')
+        job_ids = [
+            common_prefix['Prefix'][len(prefix):].rstrip('/')
+            for page in paginator.paginate(Bucket=used_s3_bucket, Prefix=prefix, Delimiter='/')
+            for common_prefix in page.get('CommonPrefixes', [])
+        ]
+        job_ids = [job_id for job_id in job_ids
+                   if (job_index.get_job(job_id) or {}).get('status') not in FINAL_JOB_STATES]
+
+        def update(job: Union['awsjob.AWSJob', Exception]) -> Optional[Exception]:
+            if isinstance(job, Exception):
+                return job
+            try:
+                job.status()
+            except Exception as ex:
+                return ex
+            return None
+
+        jobs = self.retrieve_jobs(job_ids, s3_bucket=s3_bucket, max_workers=max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            errors = list(executor.map(update, jobs))
+        updated_job_ids = []
+        for job_id, error in zip(job_ids, errors):
+            if error is None:
+                updated_job_ids.append(job_id)
+            else:
+                logger.warning(f'Could not add the job {job_id} to the job index: {error}')
+        return updated_job_ids
 
     def retrieve_job(self, job_id: str, s3_bucket: Optional[str] = None) -> 'awsjob.AWSJob':
-        qobj, extra_data = self._load_job_data_s3(job_id=job_id, s3_bucket=s3_bucket)
-        arns = self._load_job_task_arns(job_id=job_id, s3_bucket=s3_bucket)
-        tasks = [AwsQuantumTask(arn=arn) for arn in arns]
+        manifest = self._load_job_manifest_s3(job_id=job_id, s3_bucket=s3_bucket)
+        submitted_at = datetime.fromisoformat(manifest['submitted_at']) if 'submitted_at' in manifest else None
+        # Neither the qobj nor the tasks are created before they are needed: listing jobs or checking their status
+        # does not parse the qobj, and the state of a task is the first request for it.
+        tasks = [awsjob.LazyQuantumTask(arn, self._provider.get_aws_session_for_arn) for arn in manifest['task_arns']]
         job = awsjob.AWSJob(
             job_id=job_id,
-            qobj=qobj,
+            qobj=None,
             tasks=tasks,
-            extra_data=extra_data,
             s3_bucket=s3_bucket,
-            backend=self
+            backend=self,
+            date_of_creation=submitted_at,
+            job_name=manifest.get('job_name'),
+            job_tags=manifest.get('job_tags'),
+            **self._job_data_from_manifest(manifest)
         )
+        job_index: Optional[JobIndex] = self._provider.job_index
+        if job_index is not None and job_index.get_job(job_id) is None:
+            # the status is unknown until the job is polled, the creation date unless the manifest has it
+            self._add_to_job_index(job, status=None, creation_date=submitted_at)
         return job
 
+    def retrieve_jobs(self, job_ids: List[str], s3_bucket: Optional[str] = None,
+                      max_workers: int = 10) -> List[Union['awsjob.AWSJob', Exception]]:
+        # Restores many jobs at once: for every job id (in the same order) the job or the error retrieving it
+        return self._retrieve_jobs(job_ids, len(job_ids) * [s3_bucket], max_workers=max_workers)
+
+    def _retrieve_jobs(self, job_ids: List[str], s3_buckets: List[Optional[str]],
+                       max_workers: int = 10) -> List[Union['awsjob.AWSJob', Exception]]:
+        if len(job_ids) == 0:
+            return []
+        def retrieve(job_id: str, s3_bucket: Optional[str]) -> Union['awsjob.AWSJob', Exception]:
+            try:
+                return self.retrieve_job(job_id, s3_bucket=s3_bucket)
+            except Exception as ex:
+                return ex
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(job_ids))) as executor:
+            return list(executor.map(retrieve, job_ids, s3_buckets))
+
+    def _add_to_job_index(self, job: 'awsjob.AWSJob', status: Optional[JobStatus],
+                          creation_date: Optional[datetime]):
+        job_index: Optional[JobIndex] = self._provider.job_index
+        if job_index is None:
+            return
+        job_index.add_job(
+            job_id=job.job_id(),
+            backend_name=self.name(),
+            status=status,
+            creation_date=creation_date,
+            task_arns=[t.id for t in job.tasks],
+            s3_bucket=job._s3_bucket,
+            job_name=job.job_name,
+            job_tags=job.job_tags
+        )
+
     def estimate_costs(self, qobj: QasmQobj) -> Optional[float]:
         shots = qobj.config.shots
         no_experiments = len(qobj.experiments)
@@ -242,29 +421,144 @@ class AWSBackend(BaseBackend):
             time_per_experiment = timedelta(seconds=10)  # TODO: make this a better estimate: depends on no_qubits and depth
             total_time = shots * no_experiments * time_per_experiment
             return total_time.total_seconds() / 60 / 60 * cost.price
+        elif cost.unit == 'minute':
+            # Simulators bill the duration of every task, but at least 3 seconds. As the duration depends on the
+            # qubits and the depth of the circuits, the estimate is the minimum, i.e. a lower bound.
+            return no_experiments * timedelta(seconds=3).total_seconds() / 60 * cost.price
         else:
             return None
 
-    def run(self, qobj: QasmQobj, s3_bucket: Optional[str] = None, extra_data: Optional[dict] = None):
-
+    def _plan_tasks(self, circuits: List[Union[Circuit, JaqcdProgram]], shots: int, deduplicate: bool
+                    ) -> Tuple[List[Tuple[Union[Circuit, JaqcdProgram], int]], List[List['awsjob.TaskSlice']]]:
+        # Returns the tasks (circuit, shots) to be created and for every experiment the shots of the tasks that
+        # belong to it.
+        max_shots: int = self.configuration().max_shots
+        if shots > max_shots:
+            # A single task can't run this many shots: every experiment is split into tasks of at most max_shots
+            # shots, the job adds their counts up again.
+            task_specifications: List[Tuple[Union[Circuit, JaqcdProgram], int]] = []
+            experiment_slices: List[List[awsjob.TaskSlice]] = []
+            for circuit in circuits:
+                slices = []
+                for start in range(0, shots, max_shots):
+                    slices.append(awsjob.TaskSlice(len(task_specifications)))
+                    task_specifications.append((circuit, min(max_shots, shots - start)))
+                experiment_slices.append(slices)
+            return task_specifications, experiment_slices
+
+        if not deduplicate:
+            return [(circuit, shots) for circuit in circuits], [[awsjob.TaskSlice(i)] for i in range(len(circuits))]
+
+        # Identical circuits (same gates and measured qubits) are run once with the shots of all their experiments,
+        # as long as the device allows this many shots. The measurement mapping is applied per experiment later.
+        groups: Dict[str, List[int]] = OrderedDict()
+        for index, circuit in enumerate(circuits):
+            action = circuit.action if isinstance(circuit, JaqcdProgram) else circuit.to_ir().json()
+            key = hashlib.sha256(action.encode()).hexdigest()
+            groups.setdefault(key, []).append(index)
+
+        experiments_per_task = max(1, max_shots // max(1, shots))
+        task_specifications = []
+        experiment_slices = len(circuits) * [None]
+        for indices in groups.values():
+            for chunk_start in range(0, len(indices), experiments_per_task):
+                chunk = indices[chunk_start:chunk_start + experiments_per_task]
+                task_index = len(task_specifications)
+                task_specifications.append((circuits[chunk[0]], len(chunk) * shots))
+                for i, experiment_index in enumerate(chunk):
+                    experiment_slices[experiment_index] = [
+                        awsjob.TaskSlice(task_index) if len(chunk) == 1
+                        else awsjob.TaskSlice(task_index, i * shots, (i + 1) * shots)
+                    ]
+        return task_specifications, experiment_slices
+
+    def _run_jaqcd(self, task_specification: JaqcdProgram, s3_destination_folder: AwsSession.S3DestinationFolder,
+                   shots: int) -> AwsQuantumTask:
+        # The same request AwsDevice.run makes for a circuit, but with the already serialized program
+        paradigm_parameters = GateModelParameters(qubitCount=task_specification.qubit_count)
+        properties: DeviceCapabilities = self._aws_device.properties
+        if isinstance(properties, IonqDeviceCapabilities):
+            device_parameters = IonqDeviceParameters(paradigmParameters=paradigm_parameters)
+        elif isinstance(properties, RigettiDeviceCapabilities):
+            device_parameters = RigettiDeviceParameters(paradigmParameters=paradigm_parameters)
+        else:
+            device_parameters = GateModelSimulatorDeviceParameters(paradigmParameters=paradigm_parameters)
+        aws_session = self._device_aws_session()
+        task_arn = aws_session.create_quantum_task(
+            deviceArn=self._aws_device.arn,
+            outputS3Bucket=s3_destination_folder[0],
+            outputS3KeyPrefix=s3_destination_folder[1],
+            shots=shots,
+            action=task_specification.action,
+            deviceParameters=device_parameters.json()
+        )
+        return AwsQuantumTask(task_arn, aws_session, poll_timeout_seconds=awsjob.RESULTS_POLL_TIMEOUT_SECONDS,
+                              poll_interval_seconds=awsjob.RESULTS_POLL_INTERVAL_SECONDS)
+
+    def _submit_tasks(self, task_specifications: List[Tuple[Union[Circuit, JaqcdProgram], int]],
+                      s3_location: AwsSession.S3DestinationFolder, tasks: List[AwsQuantumTask], max_workers: int):
+        # On success `tasks` holds the created tasks in the order of `task_specifications`. On failure it holds all
+        # tasks that were created before submission stopped, so that the caller is able to roll them back.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._run_jaqcd if isinstance(circuit, JaqcdProgram) else self._aws_device.run,
+                                task_specification=circuit, s3_destination_folder=s3_location, shots=shots)
+                for circuit, shots in task_specifications
+            ]
+            wait(futures, return_when=FIRST_EXCEPTION)
+            for future in futures:
+                future.cancel()
+        # leaving the executor waits for all tasks that were in flight
+        errors = [f.exception() for f in futures if not f.cancelled() and f.exception() is not None]
+        tasks.extend([f.result() for f in futures if not f.cancelled() and f.exception() is None])
+        if len(errors) > 0:
+            raise errors[0]
+
+    def run(self, qobj: QasmQobj, s3_bucket: Optional[str] = None, extra_data: Optional[dict] = None,
+            max_workers: int = 10, deduplicate: bool = False, job_name: Optional[str] = None,
+            job_tags: Optional[List[str]] = None, optimization_level: int = 1, direct_ir: bool = False):
+
+        # the qubits of the transpiled circuits are canonical (0, ..., n-1), they run on the device qubits they stand for
+        qubit_mapping: Dict[int, int] = getattr(self._configuration, 'coupling_canonical_2_device', None) or {}
         # If we get here, then we can continue with running, else ValueError!
-        circuits: List[Circuit] = list(convert_qasm_qobj(qobj))
+        # With direct_ir the experiments are converted straight to JAQCD programs instead of braket circuits.
+        convert = convert_qasm_qobj_jaqcd if direct_ir else convert_qasm_qobj
+        circuits: List[Union[Circuit, JaqcdProgram]] = list(convert(qobj, optimization_level=optimization_level,
+                                                                    qubit_mapping=qubit_mapping))
         shots = qobj.config.shots
+        task_specifications, experiment_slices = self._plan_tasks(circuits, shots, deduplicate=deduplicate)
 
+        s3_location: AwsSession.S3DestinationFolder = (
+            s3_bucket or self._provider.get_default_bucket(), self._get_job_data_s3_folder(job_id=qobj.qobj_id)
+        )
         tasks: List[AwsQuantumTask] = []
+        submitted_at = datetime.now()
+        manifest = {
+            'version': _JOB_MANIFEST_VERSION,
+            'job_id': qobj.qobj_id,
+            'backend_name': self.name(),
+            'device_arn': self._aws_device.arn,
+            'submitted_at': submitted_at.isoformat(),
+            'job_name': job_name,
+            'job_tags': job_tags or [],
+            'submitting': True
+        }
+        # The job id is reserved before any task is created: this fails (ValueError) if a job with this id exists
+        self._save_job_manifest_s3(job_id=qobj.qobj_id, manifest=manifest, s3_bucket=s3_location[0])
         try:
-            s3_location: AwsSession.S3DestinationFolder = self._save_job_data_s3(qobj, s3_bucket=s3_bucket, extra_data=extra_data)
-
-            for circuit in circuits:
-                task = self._aws_device.run(
-                    task_specification=circuit,
-                    s3_destination_folder=s3_location,
-                    shots=shots
-                )
-                tasks.append(task)
-
-            task_arns = [t.id for t in tasks]
-            self._save_job_task_arns(job_id=qobj.qobj_id, task_arns=task_arns, s3_bucket=s3_location[0])
+            self._submit_tasks(task_specifications, s3_location, tasks, max_workers=max_workers)
+
+            # Everything that is needed to restore the job is written at once, see retrieve_job
+            del manifest['submitting']
+            manifest.update({
+                'qobj': qobj.to_dict(),
+                'extra_data': extra_data or {},
+                'task_arns': [t.id for t in tasks],
+                'experiment_slices': [[list(task_slice) for task_slice in slices] for slices in experiment_slices],
+                'qubit_mapping': [[q, d] for q, d in qubit_mapping.items()]
+            })
+            self._save_job_manifest_s3(job_id=qobj.qobj_id, manifest=manifest, s3_bucket=s3_location[0],
+                                       overwrite=True)
         except Exception as ex:
             logger.error(f'During creation of tasks an error occurred: {ex}')
             logger.error(f'Cancelling all tasks {len(tasks)}!')
@@ -272,8 +566,8 @@ class AWSBackend(BaseBackend):
                 logger.error(f'Attempt to cancel {task.id}...')
                 task.cancel()
                 logger.error(f'State of {task.id}: {task.state()}.')
-            self._delete_job_task_arns(qobj.qobj_id, s3_bucket=s3_bucket)
-            self._delete_job_data_s3(qobj.qobj_id, s3_bucket=s3_bucket)
+            # releases the job id
+            self._delete_job_manifest_s3(job_id=qobj.qobj_id, s3_bucket=s3_location[0])
             raise ex
 
         job = awsjob.AWSJob(
@@ -282,6 +576,16 @@ class AWSBackend(BaseBackend):
             tasks=tasks,
             extra_data=extra_data,
             s3_bucket=s3_location[0],
-            backend=self
+            backend=self,
+            experiment_slices=experiment_slices,
+            date_of_creation=submitted_at,
+            job_name=job_name,
+            job_tags=job_tags,
+            qubit_mapping=qubit_mapping
         )
+        self._add_to_job_index(job, JobStatus.INITIALIZING, job.date_of_creation)
         return job
+
+    async def run_async(self, qobj: QasmQobj, **kwargs) -> 'awsjob.AWSJob':
+        # run on the provider's shared executor, see AWSProvider.run_in_executor
+        return await self._provider.run_in_executor(self.run, qobj, **kwargs)
@@ -11,22 +11,33 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import logging
+import threading
+import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, NamedTuple, Callable, Iterator, Tuple, AsyncIterator, Union
 
-from braket.aws import AwsQuantumTask
+import numpy
+from braket.aws import AwsQuantumTask, AwsSession
 from braket.tasks import GateModelQuantumTaskResult
-from qiskit.providers import BaseJob, JobStatus
+from qiskit.providers import BaseJob, JobStatus, JobTimeoutError
 from qiskit.qobj import QasmQobj, QasmQobjExperiment, QasmQobjInstruction
 from qiskit.result import Result
 from qiskit.result.models import ExperimentResult, ExperimentResultData
 
 from . import awsbackend
+from .jobindex import JobIndex
 
 logger = logging.getLogger(__name__)
 
+# How long result() waits for a task to reach a final state and how often it polls the task's state meanwhile, the
+# same as AwsDevice.run configures for its tasks (tasks on QPUs may be queued for days)
+RESULTS_POLL_TIMEOUT_SECONDS = 432000.0
+RESULTS_POLL_INTERVAL_SECONDS = 1.0
+
 
 def _reverse_and_map(bit_string: str, mapping: Dict[int, int]):
     result_bit_string = len(mapping) * ['x']
@@ -38,34 +49,229 @@ def _reverse_and_map(bit_string: str, mapping: Dict[int, int]):
     return result
 
 
-def map_measurements(counts: Counter, qasm_experiment: QasmQobjExperiment) -> Dict[str, int]:
-    # Need to get measure mapping
+def _bit_strings_2_array(bit_strings: List[str], width: int) -> numpy.ndarray:
+    # one row per bit string, one column per character
+    raw = numpy.frombuffer("".join(bit_strings).encode('ascii'), dtype=numpy.uint8)
+    return raw.reshape(len(bit_strings), width) - ord('0')
+
+
+def _array_2_bit_strings(bits: numpy.ndarray) -> List[str]:
+    width = bits.shape[1]
+    if width == 0:
+        return bits.shape[0] * ['']
+    raw = numpy.ascontiguousarray(bits.astype(numpy.uint8) + ord('0'))
+    return [b.decode('ascii') for b in raw.view(f'S{width}').ravel()]
+
+
+def _aggregate_bits(bits: numpy.ndarray, weights: numpy.ndarray) -> Dict[str, int]:
+    width = bits.shape[1]
+    if width < 63:
+        # pack every row into one integer, the first column being the most significant bit
+        shifts = numpy.arange(width - 1, -1, -1, dtype=numpy.int64)
+        packed = (bits.astype(numpy.int64) << shifts).sum(axis=1)
+        unique_packed, inverse = numpy.unique(packed, return_inverse=True)
+        unique_bits = (unique_packed[:, None] >> shifts) & 1
+    else:
+        unique_bits, inverse = numpy.unique(bits, axis=0, return_inverse=True)
+    totals = numpy.bincount(inverse.ravel(), weights=weights, minlength=unique_bits.shape[0])
+    return dict(zip(_array_2_bit_strings(unique_bits), numpy.rint(totals).astype(numpy.int64).tolist()))
+
+
+def _measurement_columns(mapping: Dict[int, int], measured_qubits: List[int]) -> Optional[List[int]]:
+    # For every character of the resulting (qiskit) bit string, the column of the (braket) measurement that goes
+    # there. None, if the mapping does not address every classical bit or references an unmeasured qubit.
+    position = dict([(q, p) for p, q in enumerate(measured_qubits)])
+    clbit_2_qubit = dict([(m, q) for q, m in mapping.items()])
+    if set(clbit_2_qubit.keys()) != set(range(len(mapping))) \
+            or any([q not in position for q in clbit_2_qubit.values()]):
+        return None
+    return [position[clbit_2_qubit[c]] for c in reversed(range(len(mapping)))]
+
+
+def _measurement_mapping(qasm_experiment: QasmQobjExperiment) -> Dict[int, int]:
     instructions: List[QasmQobjInstruction] = [i for i in qasm_experiment.instructions if i.name == 'measure']
-    mapping = dict([(q, m) for i in instructions for q, m in zip(i.qubits, i.memory)])
-    mapped_counts = [(_reverse_and_map(k, mapping), v) for k, v in counts.items()]
-    keys = set(k for k, _ in mapped_counts)
-    new_map = [(key, sum([v for k, v in mapped_counts if k == key])) for key in keys]
-    return dict(new_map)
+    return dict([(q, m) for i in instructions for q, m in zip(i.qubits, i.memory)])
+
+
+def map_measurements(counts: Counter, qasm_experiment: QasmQobjExperiment,
+                     measured_qubits: Optional[List[int]] = None) -> Dict[str, int]:
+    # Need to get measure mapping
+    mapping = _measurement_mapping(qasm_experiment)
+    if len(counts) == 0:
+        return {}
+
+    bit_strings = list(counts.keys())
+    width = len(bit_strings[0])
+    if measured_qubits is None:
+        measured_qubits = list(range(width))
+    columns = _measurement_columns(mapping, measured_qubits)
+
+    if columns is None or any([len(k) != width for k in bit_strings]):
+        # slow path for anything the vectorized mapping cannot express
+        position_mapping = dict([(measured_qubits.index(q), m) for q, m in mapping.items() if q in measured_qubits])
+        mapped_counts = Counter()
+        for k, v in counts.items():
+            mapped_counts[_reverse_and_map(k, position_mapping)] += v
+        return dict(mapped_counts)
+    if columns == list(range(width - 1, -1, -1)):
+        # every qubit is measured into its own classical bit, so only the endianness changes
+        return dict([(k[::-1], v) for k, v in counts.items()])
+
+    bits = _bit_strings_2_array(bit_strings, width)[:, columns]
+    weights = numpy.fromiter(counts.values(), dtype=numpy.float64, count=len(counts))
+    return _aggregate_bits(bits, weights)
+
+
+def map_measurement_array(measurements: numpy.ndarray, qasm_experiment: QasmQobjExperiment,
+                          measured_qubits: Optional[List[int]] = None) -> Dict[str, int]:
+    # Same as map_measurements, but for the single shot measurements (one row per shot) of a task
+    if measured_qubits is None:
+        measured_qubits = list(range(measurements.shape[1]))
+    weights = numpy.ones(measurements.shape[0], dtype=numpy.float64)
+    columns = _measurement_columns(_measurement_mapping(qasm_experiment), measured_qubits)
+    if columns is None:
+        return map_measurements(Counter(_aggregate_bits(measurements, weights)), qasm_experiment, measured_qubits)
+    return _aggregate_bits(measurements[:, columns], weights)
+
+
+def probabilities_2_counts(probabilities: Dict[str, float], shots: int) -> Dict[str, int]:
+    # The counts of `shots` shots closest to the probabilities that add up to exactly `shots` (largest remainders)
+    exact = dict([(k, p * shots) for k, p in probabilities.items()])
+    counts = dict([(k, int(v)) for k, v in exact.items()])
+    by_remainder = sorted(exact.keys(), key=lambda k: exact[k] - counts[k], reverse=True)
+    for k in by_remainder[:max(0, shots - sum(counts.values()))]:
+        counts[k] += 1
+    return dict([(k, v) for k, v in counts.items() if v > 0])
+
+
+class TaskSlice(NamedTuple):
+    # The shots [start, stop) of the task with index task_index belong to an experiment, None means all shots
+    task_index: int
+    start: Optional[int] = None
+    stop: Optional[int] = None
+
+
+class LazyQuantumTask(object):
+    # A handle of a task by its arn. The AwsQuantumTask (and with it any request) is only created when more than the
+    # id is needed, e.g. for the state or the result.
+
+    _arn: str
+    _aws_session_for_arn: Callable[[str], AwsSession]
+    _task: Optional[AwsQuantumTask]
+
+    def __init__(self, arn: str, aws_session_for_arn: Callable[[str], AwsSession]):
+        self._arn = arn
+        self._aws_session_for_arn = aws_session_for_arn
+        self._task = None
+        self._task_lock = threading.Lock()
+
+    @property
+    def id(self) -> str:
+        return self._arn
+
+    @property
+    def task(self) -> AwsQuantumTask:
+        with self._task_lock:
+            if self._task is None:
+                self._task = AwsQuantumTask(arn=self._arn, aws_session=self._aws_session_for_arn(self._arn))
+            return self._task
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.task, name)
+
+    def __repr__(self):
+        return f'LazyQuantumTask({self._arn})'
 
 
 class AWSJob(BaseJob):
 
-    _extra_data: dict
+    _extra_data_value: dict
     _s3_bucket: str
-    _qobj: QasmQobj
+    _qobj_value: Optional[QasmQobj]
+    _qobj_loader: Optional[Callable[[], QasmQobj]]
+    _job_data_loader: Optional[Callable[[], dict]]
     _job_id: str
-    _tasks: List[AwsQuantumTask]
+    _tasks: List[Union[AwsQuantumTask, LazyQuantumTask]]
+    _experiment_slices_value: List[List[TaskSlice]]
+    _qubit_mapping_value: Dict[int, int]
+    _device_2_qobj_qubits_value: Dict[int, int]
     _backend: 'awsbackend.AWSBackend'
 
-    def __init__(self, job_id: str, qobj: QasmQobj, backend: 'awsbackend.AWSBackend', tasks: List[AwsQuantumTask],
-                 extra_data: Optional[dict] = None, s3_bucket: str = None) -> None:
+    def __init__(self, job_id: str, qobj: Optional[QasmQobj], backend: 'awsbackend.AWSBackend',
+                 tasks: List[Union[AwsQuantumTask, LazyQuantumTask]],
+                 extra_data: Optional[dict] = None, s3_bucket: str = None,
+                 experiment_slices: Optional[List[List[TaskSlice]]] = None,
+                 date_of_creation: Optional[datetime] = None, job_name: Optional[str] = None,
+                 job_tags: Optional[List[str]] = None, task_states_ttl: float = 2.0,
+                 qobj_loader: Optional[Callable[[], QasmQobj]] = None,
+                 qubit_mapping: Optional[Dict[int, int]] = None,
+                 job_data_loader: Optional[Callable[[], dict]] = None,
+                 results_poll_timeout: float = RESULTS_POLL_TIMEOUT_SECONDS,
+                 results_poll_interval: float = RESULTS_POLL_INTERVAL_SECONDS) -> None:
         super().__init__(backend, job_id)
         self._tasks = tasks
-        self._extra_data = extra_data
-        self._date_of_creation = datetime.now()
-        self._qobj = qobj
+        self._date_of_creation = date_of_creation or datetime.now()
+        self._job_name = job_name
+        self._job_tags = job_tags or []
+        # Snapshot of the tasks' states, shared by status() and result(). Final states are never fetched again.
+        self._task_states: List[Optional[str]] = len(tasks) * [None]
+        self._task_states_timestamp: Optional[float] = None
+        self._task_states_lock = threading.Lock()
+        self.task_states_ttl = task_states_ttl
+        # The results of the tasks in a final state (None for failed and cancelled tasks), see _fetch_task_result
+        self._task_results: Dict[int, Optional[GateModelQuantumTaskResult]] = {}
+        self._task_results_lock = threading.Lock()
+        self.results_poll_timeout = results_poll_timeout
+        self.results_poll_interval = results_poll_interval
         self._job_id = job_id
         self._s3_bucket = s3_bucket
+        # Either the job data (qobj, extra data, experiment slices, qubit mapping) or a function that returns them
+        # as keyword arguments of _set_job_data when they are first needed, see AWSBackend.jobs
+        self._job_data_lock = threading.RLock()
+        self._job_data_loader = job_data_loader
+        if job_data_loader is None:
+            self._set_job_data(qobj=qobj, qobj_loader=qobj_loader, extra_data=extra_data,
+                               experiment_slices=experiment_slices, qubit_mapping=qubit_mapping)
+
+    def _set_job_data(self, qobj: Optional[QasmQobj] = None, qobj_loader: Optional[Callable[[], QasmQobj]] = None,
+                      extra_data: Optional[dict] = None, experiment_slices: Optional[List[List[TaskSlice]]] = None,
+                      qubit_mapping: Optional[Dict[int, int]] = None):
+        # Either the qobj or a function that creates it when it is first needed, see AWSBackend.retrieve_job
+        self._qobj_value = qobj
+        self._qobj_loader = qobj_loader if qobj is None else None
+        self._extra_data_value = extra_data
+        # Which shots of which tasks make up an experiment, by default there is one task per experiment
+        self._experiment_slices_value = experiment_slices or [[TaskSlice(i)] for i in range(len(self._tasks))]
+        # The qubits of the qobj -> the qubits of the device the tasks ran on, see AWSBackend.run
+        self._qubit_mapping_value = qubit_mapping or {}
+        self._device_2_qobj_qubits_value = dict([(d, q) for q, d in self._qubit_mapping_value.items()])
+
+    def _load_job_data(self):
+        with self._job_data_lock:
+            if self._job_data_loader is not None:
+                self._set_job_data(**self._job_data_loader())
+                self._job_data_loader = None
+
+    @property
+    def _qobj(self) -> QasmQobj:
+        with self._job_data_lock:
+            self._load_job_data()
+            if self._qobj_value is None:
+                self._qobj_value = self._qobj_loader()
+                self._qobj_loader = None
+            return self._qobj_value
+
+    @property
+    def _experiment_slices(self) -> List[List[TaskSlice]]:
+        self._load_job_data()
+        return self._experiment_slices_value
+
+    @property
+    def _device_2_qobj_qubits(self) -> Dict[int, int]:
+        self._load_job_data()
+        return self._device_2_qobj_qubits_value
 
     @property
     def shots(self) -> int:
@@ -73,57 +279,274 @@ class AWSJob(BaseJob):
 
     @property
     def extra_data(self) -> dict:
-        return self._extra_data
+        self._load_job_data()
+        return self._extra_data_value
 
     @property
     def date_of_creation(self) -> datetime:
         return self._date_of_creation
 
     @property
-    def tasks(self) -> List[AwsQuantumTask]:
+    def tasks(self) -> List[Union[AwsQuantumTask, LazyQuantumTask]]:
         return self._tasks
 
+    @property
+    def qubit_mapping(self) -> Dict[int, int]:
+        self._load_job_data()
+        return self._qubit_mapping_value
+
+    @property
+    def job_name(self) -> Optional[str]:
+        return self._job_name
+
+    @property
+    def job_tags(self) -> List[str]:
+        return self._job_tags
+
     def submit(self):
         logger.warning("job.submit() is deprecated. Please use AWSBackend.run() to submit a job.", DeprecationWarning, stacklevel=2)
 
-    def result(self):
-        experiment_results: List[ExperimentResult] = []
-        task: AwsQuantumTask
-        qasm_experiment: QasmQobjExperiment
-        for task, qasm_experiment in zip(self._tasks, self._qobj.experiments):
-            result: GateModelQuantumTaskResult = task.result()
-            counts: Dict[str, int] = map_measurements(result.measurement_counts, qasm_experiment)
-            data = ExperimentResultData(
-                counts=dict(counts)
-            )
-            experiment_result = ExperimentResult(
-                shots=self.shots,
-                success=task.state() == 'COMPLETED',
-                header=qasm_experiment.header,
-                status=task.state(),
-                data=data
-            )
-            experiment_results.append(experiment_result)
+    def _wait_for_task(self, index: int) -> Optional[str]:
+        # Polls the state of the task until it is final or the poll timeout has passed, returns the last state
+        state = self._cached_task_states()[index]
+        deadline = time.monotonic() + self.results_poll_timeout
+        while state not in AwsQuantumTask.TERMINAL_STATES:
+            state = self._tasks[index].state()
+            self.update_task_states({index: state})
+            if state in AwsQuantumTask.TERMINAL_STATES or time.monotonic() + self.results_poll_interval > deadline:
+                break
+            time.sleep(self.results_poll_interval)
+        return state
+
+    def _download_task_result(self, index: int) -> GateModelQuantumTaskResult:
+        # The results are read with the provider's shared (pooled) S3 client
+        task: AwsQuantumTask = self._tasks[index]
+        metadata: dict = task.metadata(use_cached_value=True)
+        if 'outputS3Directory' not in (metadata or {}):
+            metadata = task.metadata()
+        response: dict = self._backend.provider().get_s3_client().get_object(
+            Bucket=metadata['outputS3Bucket'],
+            Key=f"{metadata['outputS3Directory']}/{AwsQuantumTask.RESULTS_FILENAME}"
+        )
+        return GateModelQuantumTaskResult.from_string(response['Body'].read().decode('utf-8'))
+
+    def _fetch_task_result(self, index: int) -> Optional[GateModelQuantumTaskResult]:
+        # Doesn't use AwsQuantumTask.result: it binds the task's result future to the event loop of the first thread
+        # that asks for it, so that any later call from another (executor) thread fails.
+        with self._task_results_lock:
+            if index in self._task_results:
+                return self._task_results[index]
+        state = self._wait_for_task(index)
+        if state not in AwsQuantumTask.TERMINAL_STATES:
+            # timed out, as AwsQuantumTask.result there is no result (yet)
+            return None
+        result = self._download_task_result(index) if state in AwsQuantumTask.RESULTS_READY_STATES else None
+        with self._task_results_lock:
+            self._task_results[index] = result
+        return result
+
+    def _fetch_task_results(self, max_workers: int) -> List[Optional[GateModelQuantumTaskResult]]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._fetch_task_result, range(len(self._tasks))))
+
+    def _experiment_tasks(self) -> List[List[int]]:
+        return [sorted(set([task_slice.task_index for task_slice in slices])) for slices in self._experiment_slices]
+
+    def _experiment_collector(self) -> Callable[[int, GateModelQuantumTaskResult], List[Tuple[int, ExperimentResult]]]:
+        # Takes the task results one by one (in any order) and returns the experiments that are complete with it
+        waiting = [set(tasks) for tasks in self._experiment_tasks()]
+        task_results: Dict[int, GateModelQuantumTaskResult] = {}
+
+        def collect(index: int, result: GateModelQuantumTaskResult) -> List[Tuple[int, ExperimentResult]]:
+            task_results[index] = result
+            completed = []
+            for experiment_index, tasks in enumerate(waiting):
+                if index in tasks:
+                    tasks.remove(index)
+                    if len(tasks) == 0:
+                        completed.append((experiment_index, self._experiment_result(
+                            self._qobj.experiments[experiment_index], self._experiment_slices[experiment_index],
+                            task_results, self._cached_task_states()
+                        )))
+            return completed
+
+        return collect
+
+    def iter_results(self, max_workers: int = 10) -> Iterator[Tuple[int, ExperimentResult]]:
+        # Yields (experiment index, result) as soon as all tasks of an experiment are finished
+        collect = self._experiment_collector()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = dict([(executor.submit(self._fetch_task_result, i), i) for i in range(len(self._tasks))])
+        try:
+            for future in as_completed(futures):
+                for experiment_index, experiment_result in collect(futures[future], future.result()):
+                    yield experiment_index, experiment_result
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    async def aiter_results(self, max_workers: int = 10) -> AsyncIterator[Tuple[int, ExperimentResult]]:
+        collect = self._experiment_collector()
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = dict([(loop.run_in_executor(executor, self._fetch_task_result, i), i)
+                        for i in range(len(self._tasks))])
+        try:
+            while len(pending) > 0:
+                done, _ = await asyncio.wait(list(pending.keys()), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    for experiment_index, experiment_result in collect(pending.pop(future), future.result()):
+                        yield experiment_index, experiment_result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def partial_result(self, max_workers: int = 10) -> Result:
+        # A result of only those experiments whose tasks are all finished right now
+        states = self.task_states()
+        experiment_indices = [i for i, tasks in enumerate(self._experiment_tasks())
+                              if all([states[t] in AwsQuantumTask.TERMINAL_STATES for t in tasks])]
+        task_indices = sorted(set([t for i in experiment_indices for t in self._experiment_tasks()[i]]))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            task_results = dict(zip(task_indices, executor.map(self._fetch_task_result, task_indices)))
+        states = self._cached_task_states()
+        experiment_results = [
+            self._experiment_result(self._qobj.experiments[i], self._experiment_slices[i], task_results, states)
+            for i in experiment_indices
+        ]
+        return Result(
+            backend_name=self._backend.name(),
+            backend_version=self._backend.version(),
+            qobj_id=self._qobj.qobj_id,
+            job_id=self._job_id,
+            success=len(experiment_results) == len(self._qobj.experiments) and all(
+                [r.success for r in experiment_results]),
+            results=experiment_results
+        )
+
+    def _experiment_result(self, qasm_experiment: QasmQobjExperiment, task_slices: List[TaskSlice],
+                           task_results: Union[List[GateModelQuantumTaskResult], Dict[int, GateModelQuantumTaskResult]],
+                           task_states: List[str]) -> ExperimentResult:
+        counts = Counter()
+        for task_slice in task_slices:
+            result = task_results[task_slice.task_index]
+            if result is None:
+                # failed or cancelled tasks have no result
+                continue
+            measured_qubits = result.measured_qubits
+            if measured_qubits is not None and len(self._device_2_qobj_qubits) > 0:
+                measured_qubits = [self._device_2_qobj_qubits.get(q, q) for q in measured_qubits]
+            if task_slice.start is None:
+                counts.update(map_measurements(result.measurement_counts, qasm_experiment,
+                                               measured_qubits=measured_qubits))
+            elif not result.measurements_copied_from_device and result.measurement_probabilities:
+                # Devices like IonQ return only probabilities: the measurements are rebuilt from them grouped by bit
+                # string, so a range of rows is no sample. The experiment gets its share of the probabilities.
+                shot_counts = probabilities_2_counts(result.measurement_probabilities,
+                                                     task_slice.stop - task_slice.start)
+                counts.update(map_measurements(Counter(shot_counts), qasm_experiment,
+                                               measured_qubits=measured_qubits))
+            else:
+                counts.update(map_measurement_array(result.measurements[task_slice.start:task_slice.stop],
+                                                    qasm_experiment, measured_qubits=measured_qubits))
+        states = [task_states[task_slice.task_index] for task_slice in task_slices]
+        state = next((s for s in states if s != 'COMPLETED'), 'COMPLETED')
+        data = ExperimentResultData(
+            counts=dict(counts)
+        )
+        return ExperimentResult(
+            shots=self.shots,
+            success=state == 'COMPLETED',
+            header=qasm_experiment.header,
+            status=state,
+            data=data
+        )
+
+    def task_states(self, max_age: Optional[float] = None, max_workers: int = 10) -> List[str]:
+        # The states of all tasks, fetched concurrently if the snapshot is older than max_age (default: the ttl)
+        max_age = self.task_states_ttl if max_age is None else max_age
+        with self._task_states_lock:
+            if self._task_states_timestamp is None or time.monotonic() - self._task_states_timestamp > max_age:
+                pending = [i for i, s in enumerate(self._task_states) if s not in AwsQuantumTask.TERMINAL_STATES]
+                if len(pending) > 0:
+                    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+                        states = list(executor.map(lambda i: self._tasks[i].state(), pending))
+                    for i, state in zip(pending, states):
+                        self._task_states[i] = state
+                self._task_states_timestamp = time.monotonic()
+            return list(self._task_states)
+
+    def _cached_task_states(self) -> List[Optional[str]]:
+        with self._task_states_lock:
+            return list(self._task_states)
+
+    def pending_tasks(self) -> Dict[int, Tuple[str, Optional[str]]]:
+        # task index -> (task arn, last known state) of all tasks that are not known to be in a final state
+        with self._task_states_lock:
+            return dict([(i, (task.id, state)) for i, (task, state) in enumerate(zip(self._tasks, self._task_states))
+                         if state not in AwsQuantumTask.TERMINAL_STATES])
+
+    def update_task_states(self, task_states: Dict[int, str]):
+        # states that became known elsewhere, e.g. while waiting for the results
+        with self._task_states_lock:
+            for i, state in task_states.items():
+                self._task_states[i] = state
+            if all([s is not None for s in self._task_states]):
+                self._task_states_timestamp = time.monotonic()
+
+    def result(self, max_workers: int = 10):
+        task_results: List[GateModelQuantumTaskResult] = self._fetch_task_results(max_workers=max_workers)
+        task_states: List[str] = self.task_states(max_age=float('inf'))
+
+        experiment_results: List[ExperimentResult] = [
+            self._experiment_result(qasm_experiment, task_slices, task_results, task_states)
+            for qasm_experiment, task_slices in zip(self._qobj.experiments, self._experiment_slices)
+        ]
         qiskit_result = Result(
             backend_name=self._backend.name(),
             backend_version=self._backend.version(),
             qobj_id=self._qobj.qobj_id,
             job_id=self._job_id,
-            success=self.status(),
+            success=self._job_status(task_states),
             results=experiment_results
         )
         return qiskit_result
 
+    async def result_async(self, max_workers: int = 10) -> Result:
+        return await self._backend.provider().run_in_executor(self.result, max_workers=max_workers)
+
+    def add_done_callback(self, fn: Callable[['AWSJob'], None]):
+        # fn is called with this job by the provider's job monitor once the job is in a final state
+        future = self._backend.provider().job_monitor.watch(self)
+        future.add_done_callback(lambda f: fn(self) if not f.cancelled() else None)
+
+    def wait_for_final_state(self, timeout: Optional[float] = None, wait: Optional[float] = None,
+                             callback: Optional[Callable] = None) -> JobStatus:
+        # Unlike BaseJob.wait_for_final_state this doesn't poll on its own (wait is ignored), but waits for the
+        # provider's job monitor, which polls the tasks of all watched jobs together.
+        future = self._backend.provider().job_monitor.watch(self)
+        try:
+            status: JobStatus = future.result(timeout=timeout)
+        except TimeoutError:
+            raise JobTimeoutError(f'Timeout while waiting for job {self.job_id()}.')
+        if callback is not None:
+            callback(self.job_id(), status, self)
+        return status
+
     def cancel(self):
         for task in self._tasks:
             try:
                 task.cancel()
             except Exception as ex:
                 logger.error(f"While cancelling Job {self.job_id()}, could not cancel task {task.id}. Reason: {ex}")
+        with self._task_states_lock:
+            self._task_states_timestamp = None
 
-    def status(self):
+    @staticmethod
+    def _job_status(states: List[str]) -> JobStatus:
         # FIXME: this is likely to change soon
-        states = [t.state() for t in self._tasks]
         status: JobStatus = JobStatus.INITIALIZING
         if all([s == 'CREATED' for s in states]):
             status = JobStatus.INITIALIZING
@@ -131,7 +554,7 @@ class AWSJob(BaseJob):
             status = JobStatus.QUEUED
         elif any([s == 'RUNNING' for s in states]):
             status = JobStatus.RUNNING
-        elif any([s == AwsQuantumTask.RESULTS_READY_STATES for s in states]) and any([s in ['QUEUED', 'CREATED', 'RUNNING'] for s in states]):
+        elif any([s in AwsQuantumTask.RESULTS_READY_STATES for s in states]) and any([s in ['QUEUED', 'CREATED', 'RUNNING'] for s in states]):
             status = JobStatus.RUNNING
         elif all([s == 'COMPLETED' for s in states]):
             status = JobStatus.DONE
@@ -140,3 +563,13 @@ class AWSJob(BaseJob):
         elif any([s == 'CANCELLED' for s in states]):
             status = JobStatus.CANCELLED
         return status
+
+    def status(self, max_age: Optional[float] = None):
+        status = AWSJob._job_status(self.task_states(max_age=max_age))
+        job_index: Optional[JobIndex] = self._backend.provider().job_index
+        if job_index is not None:
+            job_index.update_status(self._job_id, status)
+        return status
+
+    async def status_async(self, max_age: Optional[float] = None) -> JobStatus:
+        return await self._backend.provider().run_in_executor(self.status, max_age=max_age)
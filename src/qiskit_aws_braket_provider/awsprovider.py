@@ -11,47 +11,194 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
+import functools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
-from typing import List, Optional
+import botocore.session
+from typing import List, Optional, Dict, Callable, Any
 
 from boto3 import Session
+from botocore.config import Config
+from botocore.credentials import CredentialProvider, CredentialResolver, Credentials
 from braket.aws import AwsDevice, AwsSession
 from braket.device_schema.dwave import DwaveDeviceCapabilities
 from qiskit.providers import BaseProvider
 
 from . import awsbackend
+from .jobindex import JobIndex
+from .jobmonitor import JobMonitor
 
 logger = logging.getLogger(__name__)
 
+_default_client_config = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 5, 'mode': 'standard'}
+)
+
+
+class _SessionCredentialProvider(CredentialProvider):
+    # Hands the credentials of the provider's session (keys, assumed roles, ...) to the sessions of other regions
+
+    METHOD = 'qiskit-aws-braket-provider'
+
+    def __init__(self, credentials: Optional[Credentials]):
+        super().__init__()
+        self._credentials = credentials
+
+    def load(self) -> Optional[Credentials]:
+        return self._credentials
+
 
 class AWSProvider(BaseProvider):
 
     _aws_session: AwsSession
     _session: Session
+    _backend_cache: Dict[str, 'awsbackend.AWSBackend']
+    _backend_cache_ttl: Optional[float]
+    _backend_cache_timestamp: Optional[float]
+    _account_id: Optional[str]
+    _client_config: Config
+    _clients: dict
+    _aws_sessions: Dict[str, AwsSession]
+    job_data_codec: str
+    job_index: Optional[JobIndex]
+    _executor: Optional[ThreadPoolExecutor]
+    _executor_max_workers: int
 
-    def __init__(self, region_name: Optional[str] = None, session: Optional[Session] = None, *args, **kwargs):
+    def __init__(self, region_name: Optional[str] = None, session: Optional[Session] = None,
+                 backend_cache_ttl: Optional[float] = 300.0, client_config: Optional[Config] = None,
+                 job_data_codec: str = 'json+gzip', job_index_path: Optional[str] = None,
+                 executor_max_workers: int = 32, native_gates: bool = False, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not session:
             session = boto3.session.Session(region_name=region_name)
         self._session = session
-        self._aws_session = AwsSession(boto_session=session)
+        # boto3 clients are thread-safe, the session is not: all clients are created once (under a lock) and shared
+        self._client_config = _default_client_config.merge(client_config) if client_config else _default_client_config
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._aws_session = AwsSession(boto_session=session, braket_client=self._get_client('braket'))
+        self._aws_sessions = {session.region_name: self._aws_session}
+        # A ttl of None keeps the backends until the cache is invalidated explicitly
+        self._backend_cache = {}
+        self._backend_cache_ttl = backend_cache_ttl
+        self._backend_cache_timestamp = None
+        self._backend_cache_lock = threading.RLock()
+        # the backends' basis gates are the native gates of their devices, see aws_device_2_configuration
+        self._native_gates = native_gates
+        self._account_id = None
+        self._account_id_lock = threading.Lock()
+        # how job data is stored in S3, see serialization.encode; any codec can be read back
+        self.job_data_codec = job_data_codec
+        # the local index of submitted jobs is opt-in: a path (e.g. jobindex.DEFAULT_JOB_INDEX_PATH) or ':memory:'
+        self.job_index = JobIndex(job_index_path) if job_index_path else None
+        self._job_monitor: Optional[JobMonitor] = None
+        # the *_async methods run the blocking boto3 calls on one executor shared by all backends and jobs
+        self._executor = None
+        self._executor_max_workers = executor_max_workers
+
+    def _is_backend_cache_stale(self) -> bool:
+        if self._backend_cache_timestamp is None:
+            return True
+        if self._backend_cache_ttl is None:
+            return False
+        return time.monotonic() - self._backend_cache_timestamp > self._backend_cache_ttl
+
+    def _refresh_backend_cache(self):
+        devices: List[AwsDevice] = AwsDevice.get_devices(aws_session=self._aws_session)
+        backend_cache: Dict[str, awsbackend.AWSBackend] = {}
+        for device in devices:
+            if isinstance(device.properties, DwaveDeviceCapabilities):
+                continue
+            backend = self._backend_cache.get(device.arn)
+            if backend is not None and backend._aws_device.properties == device.properties:
+                # Keep the backend (and its converted configuration), but take the device's current status
+                backend._aws_device = device
+            else:
+                backend = awsbackend.AWSBackend(device, provider=self, native_gates=self._native_gates)
+            backend_cache[device.arn] = backend
+        self._backend_cache = backend_cache
+        self._backend_cache_timestamp = time.monotonic()
 
-    def backends(self, name=None, **kwargs) -> List['awsbackend.AWSBackend']:
-        devices: List[AwsDevice] = AwsDevice.get_devices(names=[name] if name else None, aws_session=self._aws_session)
-        backends = [awsbackend.AWSBackend(a, provider=self) for a in devices
-                    if not isinstance(a.properties, DwaveDeviceCapabilities)]
+    def invalidate_backend_cache(self):
+        with self._backend_cache_lock:
+            self._backend_cache = {}
+            self._backend_cache_timestamp = None
+
+    def backends(self, name=None, refresh: bool = False, **kwargs) -> List['awsbackend.AWSBackend']:
+        with self._backend_cache_lock:
+            if refresh or self._is_backend_cache_stale():
+                self._refresh_backend_cache()
+            backends = list(self._backend_cache.values())
+        if name:
+            backends = [b for b in backends if b.name() == name]
         return backends
 
+    async def backends_async(self, name=None, refresh: bool = False, **kwargs) -> List['awsbackend.AWSBackend']:
+        return await self.run_in_executor(self.backends, name=name, refresh=refresh, **kwargs)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._clients_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._executor_max_workers,
+                                                    thread_name_prefix='aws-braket-provider')
+            return self._executor
+
+    async def run_in_executor(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    @property
+    def job_monitor(self) -> JobMonitor:
+        with self._clients_lock:
+            if self._job_monitor is None:
+                self._job_monitor = JobMonitor(self)
+            return self._job_monitor
+
+    def _get_client(self, service_name: str):
+        with self._clients_lock:
+            if service_name not in self._clients:
+                self._clients[service_name] = self._session.client(service_name, config=self._client_config)
+            return self._clients[service_name]
+
     def get_s3_client(self):
-        return self._session.client('s3')
+        return self._get_client('s3')
+
+    def _create_regional_session(self, region: str) -> Session:
+        # A session of another region with the same credentials (and profile) as the provider's session
+        botocore_session = botocore.session.Session(profile=self._session.profile_name)
+        botocore_session.register_component(
+            'credential_provider', CredentialResolver([_SessionCredentialProvider(self._session.get_credentials())])
+        )
+        return boto3.session.Session(botocore_session=botocore_session, region_name=region)
+
+    def get_aws_session_for_arn(self, arn: str) -> AwsSession:
+        # Tasks of devices in other regions need a braket client of that region, see AwsQuantumTask. Simulators
+        # have no region in their arn.
+        region = arn.split(':')[3] or self._session.region_name
+        with self._clients_lock:
+            if region not in self._aws_sessions:
+                boto_session = self._create_regional_session(region)
+                self._aws_sessions[region] = AwsSession(
+                    boto_session=boto_session,
+                    braket_client=boto_session.client('braket', config=self._client_config)
+                )
+            return self._aws_sessions[region]
 
-    def get_default_bucket(self):
-        return f'amazon-braket-{self._get_account_id()}'
+    def get_default_bucket(self, refresh: bool = False):
+        return f'amazon-braket-{self._get_account_id(refresh=refresh)}'
 
-    def _get_account_id(self):
-        return self._session.client('sts').get_caller_identity().get('Account')
+    def _get_account_id(self, refresh: bool = False):
+        with self._account_id_lock:
+            if refresh or self._account_id is None:
+                self._account_id = self._get_client('sts').get_caller_identity().get('Account')
+            return self._account_id
 
     def get_backend(self, name=None, **kwargs) -> 'awsbackend.AWSBackend':
         return super().get_backend(name, **kwargs)
@@ -14,22 +14,26 @@
 import inspect
 import itertools
 import logging
-from typing import List, Type, Dict
+from typing import List, Type, Dict, Tuple
 
 import pint
 from braket.aws import AwsDevice
 from braket.circuits import ResultType
 from braket.device_schema import DeviceCapabilities, DeviceActionType, JaqcdDeviceActionProperties, \
     GateModelQpuParadigmProperties
+from braket.device_schema.ionq import IonqDeviceCapabilities
+from braket.device_schema.rigetti import RigettiDeviceCapabilities
 from braket.device_schema.simulators import GateModelSimulatorParadigmProperties
-from qiskit.circuit.library import SXGate, SXdgGate
+from qiskit.circuit.library import SXGate, SXdgGate, RYYGate, iSwapGate
 from qiskit.converters.ast_to_dag import AstInterpreter
 from qiskit.providers.models import QasmBackendConfiguration, GateConfig
 
+from .transpilation import _qiskit_2_braket_conversion
+
 logger = logging.getLogger(__name__)
 units = pint.UnitRegistry()
 
-# TODO: find missing mappings
+# braket (JAQCD) operation -> qiskit gate, None if qiskit has no such gate
 _known_maps = {
     'i': 'id',
     'cnot': 'cx',
@@ -38,27 +42,42 @@ _known_maps = {
     'ti': 'tdg',
     'v': 'sx',
     'vi': 'sxdg',
-    'xx': None,
+    'xx': 'rxx',
     'xy': None,
-    'yy': None,
-    'zz': None,
-    'cphaseshift': None,
+    'yy': 'ryy',
+    'zz': 'rzz',
+    'cphaseshift': 'cu1',
     'cphaseshift00': None,
     'cphaseshift01': None,
     'cphaseshift10': None,
-    'iswap': None,
+    'iswap': 'iswap',
     'pswap': None,
-    'phaseshift': None,
+    'phaseshift': 'u1',
     'unitary': None
 }
 
-# TODO: complete!
-_native_two_qubit_gates = ['cx']
-_native_three_qubit_gates = []
+# u1, u2 and u3 are converted to rx, ry and rz, which every device supports
+_u_gates = ['u1', 'u2', 'u3']
+# The native gates of the devices, if they don't report any (paradigm.nativeGateSet)
+_native_gate_sets: Dict[Type, List[str]] = {
+    RigettiDeviceCapabilities: ['rx', 'rz', 'cz'],
+    IonqDeviceCapabilities: ['rx', 'ry', 'xx']
+}
+# Native gates as the vendors name them (paradigm.nativeGateSet) -> JAQCD operation, if the names differ
+_native_gate_names = {
+    'cphase': 'cphaseshift',
+    'cphase00': 'cphaseshift00',
+    'cphase01': 'cphaseshift01',
+    'cphase10': 'cphaseshift10'
+}
+_native_two_qubit_gates = ['cx', 'cy', 'cz', 'swap', 'iswap', 'rxx', 'ryy', 'rzz', 'cu1']
+_native_three_qubit_gates = ['ccx', 'cswap']
 
 _qiskit_not_standard_extension: Dict[str, Type] = {
     'sx': SXGate,
-    'sxdg': SXdgGate
+    'sxdg': SXdgGate,
+    'ryy': RYYGate,
+    'iswap': iSwapGate
 }
 
 
@@ -99,7 +118,22 @@ def apply_coupling_map(c_map: Dict[int,List[int]], mapping: Dict[int, int]) -> D
     )
 
 
-def aws_device_2_configuration(aws_device: AwsDevice) -> QasmBackendConfiguration:
+def _qiskit_basis_gates(aws_gates: List[str]) -> Tuple[List[str], List[str]]:
+    # The qiskit gates of the JAQCD operations that can be converted, and the operations that can't
+    basis_gates: List[str] = []
+    unknown_gates: List[str] = []
+    for aws_gate in aws_gates:
+        gate = _known_maps.get(aws_gate, aws_gate)
+        if gate is None or gate not in _qiskit_2_braket_conversion:
+            unknown_gates.append(aws_gate)
+        elif gate not in basis_gates:
+            basis_gates.append(gate)
+    return basis_gates, unknown_gates
+
+
+def aws_device_2_configuration(aws_device: AwsDevice, native_gates: bool = False) -> QasmBackendConfiguration:
+    # With native_gates the basis gates are the device's native gates (if known), so that circuits transpiled for
+    # the backend need no further compilation, otherwise all operations the device supports.
     configuration: QasmBackendConfiguration
     properties: DeviceCapabilities = aws_device.properties
     basis_gates_aws: List[str] = []
@@ -120,28 +154,42 @@ def aws_device_2_configuration(aws_device: AwsDevice) -> QasmBackendConfiguratio
     is_fully_connected = False
     is_simulator = False
     native_gate_set = ['u1', 'u2', 'u3', 'cx', 'id']  # use the qiskit / IBMQ default
+    device_native_gate_set: List[str] = []
     if hasattr(properties, 'paradigm'):
         if isinstance(properties.paradigm, GateModelQpuParadigmProperties):
             num_qubits = properties.paradigm.qubitCount
             connectivity = properties.paradigm.connectivity.connectivityGraph
             is_fully_connected = properties.paradigm.connectivity.fullyConnected
-            # TODO: one day we will get data here and then do nifty things.
-            # native_gate_set = properties.paradigm.nativeGateSet
-            # if len(native_gate_set) == 0:
-            #     native_gate_set = []
+            device_native_gate_set = [_native_gate_names.get(g.lower(), g.lower())
+                                      for g in properties.paradigm.nativeGateSet or []]
         if isinstance(properties.paradigm, GateModelSimulatorParadigmProperties):
             num_qubits = properties.paradigm.qubitCount
             is_simulator = True
             is_fully_connected = True
 
-    basis_gates = [_known_maps.get(g, g) for g in native_gate_set]
-    basis_gates = [b for b in basis_gates if b]  # FIXME: print out as warning any that cannot be translated.
+    basis_gates: List[str] = []
+    if native_gates:
+        basis_gates, unknown_gates = _qiskit_basis_gates(device_native_gate_set)
+        if len(unknown_gates) > 0:
+            logger.warning(f'The native gates {unknown_gates} of {aws_device.name} have no qiskit gate and are not '
+                           f'used.')
+        if len(basis_gates) == 0:
+            # nothing (usable) reported, the known native gates of the vendor
+            default_gate_set = next((gs for t, gs in _native_gate_sets.items() if isinstance(properties, t)), [])
+            basis_gates, _ = _qiskit_basis_gates(default_gate_set)
+    if len(basis_gates) == 0:
+        if len(basis_gates_aws) > 0:
+            # all operations of the device that can be converted directly, u1, u2 and u3 are converted to rotations
+            native_gate_set = _u_gates + [g.lower() for g in basis_gates_aws]
+        basis_gates, unknown_gates = _qiskit_basis_gates(native_gate_set)
+        if len(unknown_gates) > 0:
+            logger.debug(f'The operations {unknown_gates} of {aws_device.name} have no qiskit gate and are not used.')
     gates = [gate_name_2_gate_config(g) for g in basis_gates]
 
     # Coupling
     # We need to map any arbitrary qubit numbering to a canonical mapping
     from_device_2_canonical = dict([(q, i) for i, q in enumerate(connectivity.keys())])
-    from_canonical_2_device = dict([(i, q) for i, q in enumerate(connectivity.keys())])
+    from_canonical_2_device = dict([(i, int(q)) for i, q in enumerate(connectivity.keys())])
     if is_fully_connected:
         coupling = [[q1, q2] for q1, q2 in itertools.product(range(num_qubits), range(num_qubits)) if q1 != q2]
     else:
@@ -153,11 +201,12 @@ def aws_device_2_configuration(aws_device: AwsDevice) -> QasmBackendConfiguratio
     # Add coupling information
     coupling_map_1 = [[q] for q in set([q for q_list in coupling for q in q_list])]
     coupling_map_2 = get_gate_coupling(apply_coupling_map(connectivity, from_device_2_canonical), 2)
-    # TODO: for another time maybe
-    # coupling_map_3 = get_gate_coupling(connectivity, 3)
+    coupling_map_3 = get_gate_coupling(apply_coupling_map(connectivity, from_device_2_canonical), 3)
     for gate in gates:
         if gate.name in _native_two_qubit_gates:
             gate.coupling_map = coupling_map_2
+        elif gate.name in _native_three_qubit_gates:
+            gate.coupling_map = coupling_map_3
         else:
             gate.coupling_map = coupling_map_1
 
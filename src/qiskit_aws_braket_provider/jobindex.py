@@ -0,0 +1,195 @@
+# Copyright 2020 Carsten Blank
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional, Union, Dict, Any
+
+from qiskit.providers import JobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_INDEX_PATH = os.path.join('~', '.qiskit', 'aws_braket_jobs.sqlite')
+
+_schema = [
+    '''CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        backend_name TEXT NOT NULL,
+        status TEXT,
+        creation_date TEXT,
+        s3_bucket TEXT,
+        job_name TEXT,
+        task_arns TEXT NOT NULL
+    )''',
+    'CREATE TABLE IF NOT EXISTS job_tags (job_id TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (job_id, tag))',
+    'CREATE TABLE IF NOT EXISTS tasks (task_arn TEXT PRIMARY KEY, job_id TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS jobs_backend_name ON jobs (backend_name)',
+    'CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)',
+    'CREATE INDEX IF NOT EXISTS jobs_creation_date ON jobs (creation_date)',
+    'CREATE INDEX IF NOT EXISTS job_tags_tag ON job_tags (tag)',
+    'CREATE INDEX IF NOT EXISTS tasks_job_id ON tasks (job_id)'
+]
+
+# Columns that can be used in a db_filter of AWSBackend.jobs
+_filter_columns = ['job_id', 'backend_name', 'status', 'creation_date', 's3_bucket', 'job_name']
+
+FINAL_JOB_STATES = [JobStatus.DONE, JobStatus.CANCELLED, JobStatus.ERROR]
+
+
+def _status_name(status: Union[JobStatus, str]) -> str:
+    return status.name if isinstance(status, JobStatus) else JobStatus[status.upper()].name
+
+
+def _optional_status_name(status: Optional[Union[JobStatus, str]]) -> Optional[str]:
+    return _status_name(status) if status is not None else None
+
+
+class JobIndex(object):
+    # A local (SQLite) index of the jobs submitted through the provider, so that jobs can be searched without
+    # accessing AWS. Use ':memory:' as path for an index that lives only as long as the process.
+    # The status of a job is NULL (None) until it is known, e.g. for a job that was retrieved but never polled: such
+    # jobs are left out by every status filter. The same goes for the creation date of jobs that don't have one.
+
+    def __init__(self, path: str = DEFAULT_JOB_INDEX_PATH):
+        if path != ':memory:':
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            for statement in _schema:
+                self._connection.execute(statement)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def add_job(self, job_id: str, backend_name: str, status: Optional[Union[JobStatus, str]],
+                creation_date: Optional[datetime], task_arns: List[str], s3_bucket: Optional[str] = None,
+                job_name: Optional[str] = None, job_tags: Optional[List[str]] = None):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO jobs (job_id, backend_name, status, creation_date, s3_bucket, job_name, '
+                'task_arns) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, backend_name, _optional_status_name(status),
+                 creation_date.isoformat() if creation_date is not None else None, s3_bucket, job_name,
+                 json.dumps(task_arns))
+            )
+            self._connection.execute('DELETE FROM job_tags WHERE job_id = ?', (job_id,))
+            self._connection.executemany('INSERT INTO job_tags (job_id, tag) VALUES (?, ?)',
+                                         [(job_id, tag) for tag in job_tags or []])
+            self._connection.executemany('INSERT OR REPLACE INTO tasks (task_arn, job_id) VALUES (?, ?)',
+                                         [(task_arn, job_id) for task_arn in task_arns])
+
+    def update_status(self, job_id: str, status: Union[JobStatus, str]):
+        with self._lock, self._connection:
+            self._connection.execute('UPDATE jobs SET status = ? WHERE job_id = ?', (_status_name(status), job_id))
+
+    def remove_job(self, job_id: str):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM job_tags WHERE job_id = ?', (job_id,))
+            self._connection.execute('DELETE FROM tasks WHERE job_id = ?', (job_id,))
+            self._connection.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
+
+    def add_task_job_ids(self, task_job_ids: Dict[str, str]):
+        # only the reverse mapping task arn -> job id, for jobs that are not (yet) indexed themselves
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO tasks (task_arn, job_id) VALUES (?, ?)',
+                                         list(task_job_ids.items()))
+
+    def get_task_job_ids(self, task_arns: List[str]) -> Dict[str, str]:
+        result: Dict[str, str] = {}
+        with self._lock:
+            # SQLite limits the number of parameters of a statement
+            for start in range(0, len(task_arns), 500):
+                chunk = task_arns[start:start + 500]
+                result.update([(row['task_arn'], row['job_id']) for row in self._connection.execute(
+                    f"SELECT task_arn, job_id FROM tasks WHERE task_arn IN ({', '.join(len(chunk) * ['?'])})", chunk
+                )])
+        return result
+
+    def _to_record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record['status'] = JobStatus[record['status']] if record['status'] is not None else None
+        record['creation_date'] = datetime.fromisoformat(record['creation_date']) \
+            if record['creation_date'] is not None else None
+        record['task_arns'] = json.loads(record['task_arns'])
+        record['job_tags'] = [r['tag'] for r in self._connection.execute(
+            'SELECT tag FROM job_tags WHERE job_id = ? ORDER BY tag', (record['job_id'],)
+        )]
+        return record
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            return self._to_record(row) if row is not None else None
+
+    def find_jobs(
+            self,
+            backend_name: Optional[str] = None,
+            limit: Optional[int] = 10,
+            skip: int = 0,
+            status: Optional[Union[JobStatus, str, List[Union[JobStatus, str]]]] = None,
+            job_name: Optional[str] = None,
+            start_datetime: Optional[datetime] = None,
+            end_datetime: Optional[datetime] = None,
+            job_tags: Optional[List[str]] = None,
+            job_tags_operator: Optional[str] = "OR",
+            descending: bool = True,
+            db_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        if backend_name is not None:
+            conditions.append('backend_name = ?')
+            parameters.append(backend_name)
+        if status is not None:
+            statuses = status if isinstance(status, list) else [status]
+            conditions.append(f"status IN ({', '.join(len(statuses) * ['?'])})")
+            parameters += [_status_name(s) for s in statuses]
+        if job_name is not None:
+            conditions.append('job_name = ?')
+            parameters.append(job_name)
+        if start_datetime is not None:
+            conditions.append('creation_date >= ?')
+            parameters.append(start_datetime.isoformat())
+        if end_datetime is not None:
+            conditions.append('creation_date <= ?')
+            parameters.append(end_datetime.isoformat())
+        if job_tags:
+            if job_tags_operator.upper() not in ['OR', 'AND']:
+                raise ValueError(f'The job tags operator {job_tags_operator} is not known, use OR or AND.')
+            conditions.append(
+                f"job_id IN (SELECT job_id FROM job_tags WHERE tag IN ({', '.join(len(job_tags) * ['?'])}) "
+                f"GROUP BY job_id HAVING COUNT(DISTINCT tag) >= ?)"
+            )
+            parameters += list(job_tags) + [len(set(job_tags)) if job_tags_operator.upper() == 'AND' else 1]
+        for column, value in (db_filter or {}).items():
+            if column not in _filter_columns:
+                raise ValueError(f'The column {column} cannot be filtered, use one of {_filter_columns}.')
+            conditions.append(f'{column} = ?')
+            parameters.append(_status_name(value) if column == 'status' else value)
+
+        query = 'SELECT * FROM jobs'
+        if len(conditions) > 0:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += f" ORDER BY creation_date {'DESC' if descending else 'ASC'} LIMIT ? OFFSET ?"
+        parameters += [limit if limit is not None else -1, skip]
+        with self._lock:
+            return [self._to_record(row) for row in self._connection.execute(query, parameters).fetchall()]
@@ -0,0 +1,132 @@
+# Copyright 2020 Carsten Blank
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
+
+from qiskit.providers import JobStatus
+
+from . import awsjob
+from . import awsprovider
+from .jobindex import FINAL_JOB_STATES
+
+logger = logging.getLogger(__name__)
+
+
+class JobMonitor(object):
+    # Polls the tasks of all watched jobs in one background thread: every distinct task arn is fetched once per
+    # round, no matter how many callers wait for its job. While anything runs or changes the monitor polls every
+    # min_interval seconds, while everything just waits in the queue the interval grows up to max_interval.
+
+    _provider: 'awsprovider.AWSProvider'
+    _watched: Dict[str, Tuple['awsjob.AWSJob', Future]]
+
+    def __init__(self, provider: 'awsprovider.AWSProvider', min_interval: float = 1.0, max_interval: float = 60.0,
+                 backoff_factor: float = 2.0, max_workers: int = 10):
+        self._provider = provider
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.max_workers = max_workers
+        self._watched = {}
+        self._lock = threading.Lock()
+        self._wake_up = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, job: 'awsjob.AWSJob') -> Future:
+        # The future resolves to the final JobStatus of the job
+        with self._lock:
+            if job.job_id() in self._watched:
+                return self._watched[job.job_id()][1]
+            future = Future()
+            self._watched[job.job_id()] = (job, future)
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name='aws-braket-job-monitor', daemon=True)
+                self._thread.start()
+        self._wake_up.set()
+        return future
+
+    def unwatch(self, job: 'awsjob.AWSJob'):
+        with self._lock:
+            entry = self._watched.pop(job.job_id(), None)
+        if entry is not None:
+            entry[1].cancel()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+        self._wake_up.set()
+
+    @property
+    def watched_jobs(self) -> List['awsjob.AWSJob']:
+        with self._lock:
+            return [job for job, _ in self._watched.values()]
+
+    def _fetch_state(self, task_arn: str) -> Optional[str]:
+        client = self._provider.get_aws_session_for_arn(task_arn).braket_client
+        try:
+            return client.get_quantum_task(quantumTaskArn=task_arn)['status']
+        except Exception as ex:
+            logger.warning(f'Could not fetch the state of task {task_arn}: {ex}')
+            return None
+
+    def _poll(self) -> bool:
+        # One round over all watched jobs, returns whether anything is running or has changed
+        with self._lock:
+            watched = list(self._watched.values())
+        pending: Dict[str, List[Tuple['awsjob.AWSJob', int, Optional[str]]]] = {}
+        for job, _ in watched:
+            for i, (task_arn, state) in job.pending_tasks().items():
+                pending.setdefault(task_arn, []).append((job, i, state))
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as executor:
+            states = dict(zip(pending.keys(), executor.map(self._fetch_state, pending.keys())))
+
+        active = False
+        for task_arn, state in states.items():
+            if state is None:
+                continue
+            for job, i, previous_state in pending[task_arn]:
+                active = active or state == 'RUNNING' or state != previous_state
+                job.update_task_states({i: state})
+
+        for job, future in watched:
+            status: JobStatus = job.status(max_age=float('inf'))
+            if status in FINAL_JOB_STATES:
+                with self._lock:
+                    self._watched.pop(job.job_id(), None)
+                if not future.done():
+                    future.set_result(status)
+        return active
+
+    def _run(self):
+        interval = self.min_interval
+        while True:
+            with self._lock:
+                if self._stopped or len(self._watched) == 0:
+                    self._thread = None
+                    return
+            self._wake_up.clear()
+            try:
+                active = self._poll()
+            except Exception as ex:
+                logger.error(f'The job monitor could not poll the tasks: {ex}')
+                active = False
+            interval = self.min_interval if active else min(self.max_interval, interval * self.backoff_factor)
+            # newly watched jobs are polled right away
+            if self._wake_up.wait(timeout=interval):
+                interval = self.min_interval
@@ -0,0 +1,108 @@
+# Copyright 2020 Carsten Blank
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import gzip
+import json
+import logging
+from typing import Callable, Dict, Tuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# A codec is named '<encoding>' or '<encoding>+<compression>', e.g. 'json+gzip'. On decoding the compression is
+# detected by the magic bytes of the data and the encoding by its first byte, so that any stored object can be read
+# regardless of the codec it was written with (including the plain json written by earlier versions). The data of
+# any other encoding (see register_encoding) starts with _ENCODING_MARKER, the encoding's name and a newline.
+_ENCODING_MARKER = b'\x00encoding:'
+_detected_encodings = ['json', 'msgpack']
+_encodings: Dict[str, Tuple[Callable[[dict], bytes], Callable[[bytes], dict]]] = {
+    'json': (
+        lambda data: json.dumps(data).encode(),
+        lambda data: json.loads(data.decode())
+    )
+}
+_compressions: Dict[str, Tuple[bytes, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    'gzip': (b'\x1f\x8b', lambda data: gzip.compress(data, compresslevel=6), gzip.decompress)
+}
+
+if msgpack is not None:
+    _encodings['msgpack'] = (
+        lambda data: msgpack.packb(data, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+    )
+
+if zstandard is not None:
+    _compressions['zstd'] = (
+        b'\x28\xb5\x2f\xfd',
+        lambda data: zstandard.ZstdCompressor().compress(data),
+        # the frame may not carry the content size, hence the streaming reader
+        lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    )
+
+
+def register_encoding(name: str, encode: Callable[[dict], bytes], decode: Callable[[bytes], dict]):
+    if name in _detected_encodings or '+' in name or '\n' in name:
+        raise ValueError(f'The name {name} cannot be used for an encoding.')
+    _encodings[name] = (encode, decode)
+
+
+def register_compression(name: str, magic: bytes, compress: Callable[[bytes], bytes],
+                         decompress: Callable[[bytes], bytes]):
+    _compressions[name] = (magic, compress, decompress)
+
+
+def _parse_codec(codec: str) -> Tuple[str, Optional[str]]:
+    encoding, _, compression = codec.partition('+')
+    if encoding not in _encodings:
+        raise ValueError(f'Encoding {encoding} is not known or its package is not installed.')
+    if compression and compression not in _compressions:
+        raise ValueError(f'Compression {compression} is not known or its package is not installed.')
+    return encoding, compression or None
+
+
+def encode(data: dict, codec: str = 'json+gzip') -> bytes:
+    encoding, compression = _parse_codec(codec)
+    raw: bytes = _encodings[encoding][0](data)
+    if encoding not in _detected_encodings:
+        raw = _ENCODING_MARKER + encoding.encode() + b'\n' + raw
+    if compression:
+        raw = _compressions[compression][1](raw)
+    return raw
+
+
+def decode(raw: bytes) -> Union[dict, list]:
+    for name, (magic, _, decompress) in _compressions.items():
+        if raw.startswith(magic):
+            raw = decompress(raw)
+            break
+    if raw.startswith(_ENCODING_MARKER):
+        name, _, raw = raw[len(_ENCODING_MARKER):].partition(b'\n')
+        encoding = name.decode()
+        if encoding not in _encodings:
+            raise ValueError(f'The data is encoded with {encoding}, which is not registered.')
+        return _encodings[encoding][1](raw)
+    stripped = raw.lstrip()
+    if stripped.startswith(b'{') or stripped.startswith(b'['):
+        return _encodings['json'][1](raw)
+    if 'msgpack' in _encodings:
+        return _encodings['msgpack'][1](raw)
+    raise ValueError('The data is neither json nor can it be decoded as msgpack (is msgpack installed?).')
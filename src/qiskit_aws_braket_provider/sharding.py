@@ -0,0 +1,201 @@
+# Copyright 2020 Carsten Blank
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Callable, Union, Dict
+
+from qiskit.providers import BaseBackend, BaseJob, JobStatus
+from qiskit.providers.models import QasmBackendConfiguration, BackendStatus
+from qiskit.qobj import QasmQobj
+from qiskit.result import Result
+from qiskit.result.models import ExperimentResult
+
+from . import awsbackend
+from . import awsjob
+
+logger = logging.getLogger(__name__)
+
+# A policy assigns every experiment of the qobj to the index of a backend
+ShardingPolicy = Callable[[List['awsbackend.AWSBackend'], QasmQobj], List[int]]
+
+
+def round_robin_policy(backends: List['awsbackend.AWSBackend'], qobj: QasmQobj) -> List[int]:
+    return [i % len(backends) for i in range(len(qobj.experiments))]
+
+
+def queue_depth_policy(backends: List['awsbackend.AWSBackend'], qobj: QasmQobj) -> List[int]:
+    # Every experiment goes to the backend with the fewest waiting tasks (see AWSBackend.queue_depth), counting the
+    # experiments assigned so far
+    statuses: List[BackendStatus] = [b.status() for b in backends]
+    candidates = [i for i, s in enumerate(statuses) if s.operational] or list(range(len(backends)))
+    with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+        load: Dict[int, int] = dict(zip(candidates, executor.map(lambda i: backends[i].queue_depth(), candidates)))
+    assignment = []
+    for _ in qobj.experiments:
+        index = min(candidates, key=lambda i: load[i])
+        load[index] += 1
+        assignment.append(index)
+    return assignment
+
+
+def cost_policy(backends: List['awsbackend.AWSBackend'], qobj: QasmQobj) -> List[int]:
+    # Only the cheapest backends are used, the experiments are spread evenly across them. Backends without a cost
+    # estimate (see AWSBackend.estimate_costs) are not considered, unless no backend has one.
+    costs = [b.estimate_costs(qobj) for b in backends]
+    known_costs = [c for c in costs if c is not None]
+    if len(known_costs) == 0:
+        return round_robin_policy(backends, qobj)
+    cheapest = [i for i, c in enumerate(costs) if c is not None and c <= min(known_costs) * (1 + 1e-9)]
+    return [cheapest[i % len(cheapest)] for i in range(len(qobj.experiments))]
+
+
+_policies: Dict[str, ShardingPolicy] = {
+    'round_robin': round_robin_policy,
+    'queue_depth': queue_depth_policy,
+    'cost': cost_policy
+}
+
+
+class ShardedJob(BaseJob):
+
+    _qobj: QasmQobj
+    _shard_jobs: List['awsjob.AWSJob']
+    _experiment_indices: List[List[int]]
+    _backend: 'ShardedBackend'
+
+    def __init__(self, job_id: str, qobj: QasmQobj, backend: 'ShardedBackend', shard_jobs: List['awsjob.AWSJob'],
+                 experiment_indices: List[List[int]]) -> None:
+        super().__init__(backend, job_id)
+        self._qobj = qobj
+        self._shard_jobs = shard_jobs
+        # for every shard the indices of its experiments within the qobj
+        self._experiment_indices = experiment_indices
+
+    @property
+    def shard_jobs(self) -> List['awsjob.AWSJob']:
+        return self._shard_jobs
+
+    def submit(self):
+        logger.warning("job.submit() is deprecated. Please use ShardedBackend.run() to submit a job.",
+                       DeprecationWarning, stacklevel=2)
+
+    def result(self, max_workers: int = 10) -> Result:
+        with ThreadPoolExecutor(max_workers=max(1, len(self._shard_jobs))) as executor:
+            shard_results: List[Result] = list(executor.map(lambda j: j.result(max_workers=max_workers),
+                                                            self._shard_jobs))
+        experiment_results: List[Optional[ExperimentResult]] = len(self._qobj.experiments) * [None]
+        for shard_result, indices in zip(shard_results, self._experiment_indices):
+            for experiment_result, index in zip(shard_result.results, indices):
+                experiment_results[index] = experiment_result
+        return Result(
+            backend_name=self._backend.name(),
+            backend_version=self._backend.version(),
+            qobj_id=self._qobj.qobj_id,
+            job_id=self.job_id(),
+            success=all([r.success for r in experiment_results]),
+            results=experiment_results
+        )
+
+    def cancel(self):
+        for job in self._shard_jobs:
+            job.cancel()
+
+    def status(self) -> JobStatus:
+        statuses = [job.status() for job in self._shard_jobs]
+        for status in [JobStatus.ERROR, JobStatus.CANCELLED, JobStatus.RUNNING, JobStatus.QUEUED,
+                       JobStatus.INITIALIZING]:
+            if status in statuses:
+                return status
+        return JobStatus.DONE
+
+
+class ShardedBackend(BaseBackend):
+
+    _backends: List['awsbackend.AWSBackend']
+    _policy: ShardingPolicy
+
+    def __init__(self, backends: List['awsbackend.AWSBackend'],
+                 policy: Union[str, ShardingPolicy] = 'round_robin', name: Optional[str] = None):
+        # The backends are expected to be interchangeable, hence the configuration of the first one is used
+        if len(backends) == 0:
+            raise ValueError('At least one backend is needed.')
+        configuration: QasmBackendConfiguration = copy.copy(backends[0].configuration())
+        configuration.backend_name = name or f"sharded({', '.join([b.name() for b in backends])})"
+        super().__init__(configuration, backends[0].provider())
+        self._backends = backends
+        if isinstance(policy, str):
+            if policy not in _policies:
+                raise ValueError(f'Policy {policy} is not known, use one of {list(_policies.keys())}.')
+            policy = _policies[policy]
+        self._policy = policy
+
+    @property
+    def backends(self) -> List['awsbackend.AWSBackend']:
+        return self._backends
+
+    def properties(self):
+        return self._backends[0].properties()
+
+    def status(self) -> BackendStatus:
+        statuses = [b.status() for b in self._backends]
+        return BackendStatus(
+            backend_name=self.name(),
+            backend_version=self.version(),
+            operational=any([s.operational for s in statuses]),
+            pending_jobs=sum([s.pending_jobs for s in statuses]),
+            status_msg=', '.join([f'{b.name()}: {s.status_msg}' for b, s in zip(self._backends, statuses)])
+        )
+
+    def _shard_qobj(self, qobj: QasmQobj) -> List[List[int]]:
+        assignment = self._policy(self._backends, qobj)
+        return [[i for i, b in enumerate(assignment) if b == index] for index in range(len(self._backends))]
+
+    def run(self, qobj: QasmQobj, s3_bucket: Optional[str] = None, extra_data: Optional[dict] = None,
+            **kwargs) -> ShardedJob:
+        if len(qobj.experiments) == 0:
+            raise ValueError(f'The qobj {qobj.qobj_id} has no experiments.')
+        experiment_indices = self._shard_qobj(qobj)
+        shards = [
+            (backend, indices, QasmQobj(
+                qobj_id=f'{qobj.qobj_id}-shard-{number}',
+                config=qobj.config,
+                experiments=[qobj.experiments[i] for i in indices],
+                header=qobj.header
+            ))
+            for number, (backend, indices) in enumerate(zip(self._backends, experiment_indices))
+            if len(indices) > 0
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [
+                executor.submit(backend.run, shard_qobj, s3_bucket=s3_bucket, extra_data=extra_data, **kwargs)
+                for backend, _, shard_qobj in shards
+            ]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        shard_jobs = [f.result() for f in futures if f.exception() is None]
+        if len(errors) > 0:
+            # all or nothing, as with a single backend
+            logger.error(f'During creation of the shards an error occurred: {errors[0]}')
+            for job in shard_jobs:
+                job.cancel()
+            raise errors[0]
+
+        return ShardedJob(
+            job_id=qobj.qobj_id,
+            qobj=qobj,
+            backend=self,
+            shard_jobs=shard_jobs,
+            experiment_indices=[indices for _, indices, _ in shards]
+        )
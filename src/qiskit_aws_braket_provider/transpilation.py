@@ -11,8 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
+import json
 import logging
-from typing import Iterable, List
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, NamedTuple, Tuple, Dict, Optional, Type, Any, Callable, Union
 
 import braket.circuits.gates as gates
 import numpy
@@ -21,78 +25,326 @@ from qiskit.qobj import QasmQobj, QasmQobjExperiment, QasmQobjInstruction
 
 logger = logging.getLogger(__name__)
 
-# _qiskit_2_braket_conversion = {
-#     # "u1": U1Gate,
-#     # "u2": U2Gate,
-#     # "u3": U3Gate,
-#     "x": gates.X,
-#     "y": gates.Y,
-#     "z": gates.Z,
-#     "t": gates.T,
-#     "tdg": gates.Ti,
-#     "s": gates.S,
-#     "sdg": gates.Si,
-#     "sx": gates.V,
-#     "sxdg": gates.Vi,
-#     "swap": gates.Swap,
-#     "rx": gates.Rx,
-#     # "rxx": RXXGate,
-#     "ry": gates.Ry,
-#     "rz": gates.Rz,
-#     # "rzz": RZZGate,
-#     "id": gates.I,
-#     "h": gates.H,
-#     "cx": gates.CNot,
-#     "cy": gates.CY,
-#     "cz": gates.CZ,
-#     # "ch": CHGate,
-#     # "crx": CRXGate,
-#     # "cry": CRYGate,
-#     # "crz": CRZGate,
-#     # "cu1": CU1Gate,
-#     # "cu3": CU3Gate,
-#     "ccx": gates.CCNot,
-#     "cswap": gates.CSwap
-# }
-
-# TODO: look into a possibility to use device's native gates set (no the IBMQ natives!)
-# First element is executed first!
+
+def _gate(name: str):
+    # a qiskit gate that braket has with the same parameters
+    return lambda *params: [(name, tuple(params))]
+
+
+# First element is executed first! Gates are given by their (lower case) braket / JAQCD name and parameters.
 _qiskit_2_braket_conversion = {
-    "u1": lambda lam: [gates.Rz(lam)],
-    "u2": lambda phi, lam: [gates.Rz(lam), gates.Ry(numpy.pi/2), gates.Rz(phi)],
-    "u3": lambda theta, phi, lam: [gates.Rz(lam),
-                                   gates.Rx(numpy.pi/2),
-                                   gates.Rz(theta),
-                                   gates.Rx(-numpy.pi/2),
-                                   gates.Rz(phi)],
-    "cx": lambda: [gates.CNot()]
+    "u1": lambda lam: [('rz', (lam,))],
+    "u2": lambda phi, lam: [('rz', (lam,)), ('ry', (numpy.pi/2,)), ('rz', (phi,))],
+    "u3": lambda theta, phi, lam: [('rz', (lam,)),
+                                   ('rx', (numpy.pi/2,)),
+                                   ('rz', (theta,)),
+                                   ('rx', (-numpy.pi/2,)),
+                                   ('rz', (phi,))],
+    "x": _gate('x'),
+    "y": _gate('y'),
+    "z": _gate('z'),
+    "t": _gate('t'),
+    "tdg": _gate('ti'),
+    "s": _gate('s'),
+    "sdg": _gate('si'),
+    "sx": _gate('v'),
+    "sxdg": _gate('vi'),
+    "swap": _gate('swap'),
+    "iswap": _gate('iswap'),
+    "rx": _gate('rx'),
+    "rxx": _gate('xx'),
+    "ry": _gate('ry'),
+    "ryy": _gate('yy'),
+    "rz": _gate('rz'),
+    "rzz": _gate('zz'),
+    "id": _gate('i'),
+    "h": _gate('h'),
+    "cx": _gate('cnot'),
+    "cy": _gate('cy'),
+    "cz": _gate('cz'),
+    "cu1": _gate('cphaseshift'),
+    "ccx": _gate('ccnot'),
+    "cswap": _gate('cswap')
 }
 
+_braket_gates: Dict[str, Type[Gate]] = dict([(g.__name__.lower(), g) for g in [
+    gates.I, gates.H, gates.X, gates.Y, gates.Z, gates.S, gates.Si, gates.T, gates.Ti, gates.V, gates.Vi,
+    gates.Rx, gates.Ry, gates.Rz, gates.PhaseShift, gates.CNot, gates.Swap, gates.ISwap, gates.PSwap, gates.XY,
+    gates.CPhaseShift, gates.CPhaseShift00, gates.CPhaseShift01, gates.CPhaseShift10, gates.CY, gates.CZ,
+    gates.XX, gates.YY, gates.ZZ, gates.CCNot, gates.CSwap
+]])
+
+# Peephole optimization of the operations, see optimize_operations:
+# 1: identities and rotations by a zero angle are dropped, adjacent rotations about the same axis are fused
+# 2: additionally adjacent pairs of gates that are inverse to each other cancel out
+_rotations = ['rx', 'ry', 'rz', 'phaseshift', 'xx', 'yy', 'zz', 'cphaseshift']
+_inverses = dict(
+    [(g, g) for g in ['h', 'x', 'y', 'z', 'cnot', 'cy', 'cz', 'swap', 'ccnot', 'cswap']]
+    + [('s', 'si'), ('si', 's'), ('t', 'ti'), ('ti', 't'), ('v', 'vi'), ('vi', 'v')]
+)
+# gates whose targets can be swapped
+_symmetric_gates = ['cz', 'swap', 'iswap', 'xx', 'yy', 'zz', 'cphaseshift']
+
+
+# How the qubits of a gate are written in a JAQCD instruction
+_jaqcd_layouts: Dict[str, str] = dict(
+    [(g, 'target') for g in ['i', 'h', 'x', 'y', 'z', 's', 'si', 't', 'ti', 'v', 'vi', 'rx', 'ry', 'rz', 'phaseshift']]
+    + [(g, 'targets') for g in ['swap', 'iswap', 'pswap', 'xy', 'xx', 'yy', 'zz']]
+    + [(g, 'control_target') for g in ['cnot', 'cy', 'cz', 'cphaseshift', 'cphaseshift00', 'cphaseshift01',
+                                       'cphaseshift10']]
+    + [('ccnot', 'controls_target'), ('cswap', 'control_targets')]
+)
+
+_jaqcd_program_header = {'name': 'braket.ir.jaqcd.program', 'version': '1'}
 
-def convert_experiment(experiment: QasmQobjExperiment) -> Circuit:
-    qc = Circuit()
 
+class Operation(NamedTuple):
+    # A gate by its braket name, or 'measure' / 'barrier'
+    name: str
+    targets: Tuple[int, ...]
+    params: Tuple[float, ...] = ()
+
+
+class JaqcdProgram(NamedTuple):
+    # A serialized JAQCD program, as it is submitted to braket, see AWSBackend.run
+    action: str
+    qubit_count: int
+
+
+def experiment_2_operations(experiment: QasmQobjExperiment,
+                            qubit_mapping: Optional[Dict[int, int]] = None) -> List[Operation]:
+    # qubit_mapping takes the (canonical) qubits of the qobj to the qubits of the device, see
+    # aws_device_2_configuration. Qubits that aren't mapped are kept.
+    qubit_mapping = qubit_mapping or {}
+    operations: List[Operation] = []
     qasm_obj_instruction: QasmQobjInstruction
     for qasm_obj_instruction in experiment.instructions:
         name = qasm_obj_instruction.name
-        if name == 'measure':
-            qc.add_result_type(result_types.Probability(qasm_obj_instruction.qubits))
-        elif name == 'barrier':
-            # This does not exist
-            pass
+        targets = tuple([qubit_mapping.get(q, q) for q in qasm_obj_instruction.qubits])
+        if name in ['measure', 'barrier']:
+            operations.append(Operation(name, targets))
         else:
             params = []
             if hasattr(qasm_obj_instruction, 'params'):
                 params = qasm_obj_instruction.params
-            gates: List[Gate] = _qiskit_2_braket_conversion[name](*params)
-            for gate in gates:
-                instruction = Instruction(operator=gate, target=qasm_obj_instruction.qubits)
-                qc += instruction
+            operations += [Operation(gate_name, targets, tuple(gate_params))
+                           for gate_name, gate_params in _qiskit_2_braket_conversion[name](*params)]
+    return operations
+
+
+def _is_zero_angle(angle: float) -> bool:
+    angle = numpy.mod(angle, 2 * numpy.pi)
+    return bool(numpy.isclose(angle, 0.0) or numpy.isclose(angle, 2 * numpy.pi))
 
+
+def _same_targets(a: Operation, b: Operation) -> bool:
+    return a.targets == b.targets or (a.name in _symmetric_gates and sorted(a.targets) == sorted(b.targets))
+
+
+def _merge(a: Operation, b: Operation, optimization_level: int) -> Tuple[bool, Optional[Operation]]:
+    # (True, op) if b directly after a is op, (True, None) if both cancel out, (False, None) if nothing changes
+    if optimization_level >= 1 and a.name == b.name and a.name in _rotations and _same_targets(a, b):
+        angle = a.params[0] + b.params[0]
+        return True, None if _is_zero_angle(angle) else Operation(a.name, a.targets, (angle,))
+    if optimization_level >= 2 and _inverses.get(a.name) == b.name and _same_targets(a, b):
+        return True, None
+    return False, None
+
+
+def optimize_operations(operations: List[Operation], optimization_level: int = 1) -> List[Operation]:
+    if optimization_level <= 0:
+        return list(operations)
+    result: List[Optional[Operation]] = []
+    # for every qubit the indices (into result) of the operations on it, the last one is the latest
+    stacks: Dict[int, List[int]] = {}
+    for operation in operations:
+        if operation.name == 'i' or (operation.name in _rotations and _is_zero_angle(operation.params[0])):
+            continue
+        # An operation can only be merged with the one before, if that is the latest operation on all its qubits.
+        # Measurements and barriers never merge, so nothing is moved across them.
+        latest = set([stacks[q][-1] if len(stacks.get(q, [])) > 0 else None for q in operation.targets])
+        if len(latest) == 1 and None not in latest:
+            index = latest.pop()
+            previous: Operation = result[index]
+            merged, merged_operation = _merge(previous, operation, optimization_level) \
+                if len(previous.targets) == len(operation.targets) else (False, None)
+            if merged:
+                result[index] = None
+                for q in previous.targets:
+                    stacks[q].pop()
+                if merged_operation is None:
+                    continue
+                operation = merged_operation
+        for q in operation.targets:
+            stacks.setdefault(q, []).append(len(result))
+        result.append(operation)
+    return [o for o in result if o is not None]
+
+
+def operations_2_circuit(operations: List[Operation]) -> Circuit:
+    qc = Circuit()
+    for operation in operations:
+        if operation.name == 'measure':
+            qc.add_result_type(result_types.Probability(list(operation.targets)))
+        elif operation.name == 'barrier':
+            # This does not exist
+            pass
+        else:
+            qc += Instruction(operator=_braket_gates[operation.name](*operation.params), target=operation.targets)
     return qc
 
 
-def convert_qasm_qobj(qobj: QasmQobj) -> Iterable[Circuit]:
+def _jaqcd_instruction(operation: Operation) -> dict:
+    instruction = {'type': operation.name}
+    layout = _jaqcd_layouts[operation.name]
+    targets = list(operation.targets)
+    if layout == 'target':
+        instruction['target'] = targets[0]
+    elif layout == 'targets':
+        instruction['targets'] = targets
+    elif layout == 'control_target':
+        instruction['control'], instruction['target'] = targets
+    elif layout == 'controls_target':
+        instruction['controls'], instruction['target'] = targets[:-1], targets[-1]
+    else:
+        instruction['control'], instruction['targets'] = targets[0], targets[1:]
+    if len(operation.params) > 0:
+        instruction['angle'] = float(operation.params[0])
+    return instruction
+
+
+def operations_2_jaqcd(operations: List[Operation]) -> JaqcdProgram:
+    # The same program as operations_2_circuit(operations).to_ir(), without creating the circuit
+    instructions = []
+    results = []
+    qubits = set()
+    for operation in operations:
+        if operation.name == 'measure':
+            result = {'type': 'probability', 'targets': list(operation.targets)}
+            if result not in results:
+                results.append(result)
+        elif operation.name == 'barrier':
+            continue
+        else:
+            instructions.append(_jaqcd_instruction(operation))
+        qubits.update(operation.targets)
+    program = {
+        'braketSchemaHeader': _jaqcd_program_header,
+        'instructions': instructions,
+        'results': results,
+        'basis_rotation_instructions': []
+    }
+    return JaqcdProgram(action=json.dumps(program), qubit_count=len(qubits))
+
+
+class ConversionCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _ConversionCache(object):
+    # A bounded LRU cache of converted experiments, shared by all conversions of the process. Only immutable values
+    # are cached: the optimized operations of a circuit (every caller gets a new Circuit) and JAQCD programs.
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Union[Tuple[Operation, ...], JaqcdProgram]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, convert: Callable[[], Union[Tuple[Operation, ...], JaqcdProgram]]
+            ) -> Union[Tuple[Operation, ...], JaqcdProgram]:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        value = convert()
+        with self._lock:
+            if self.maxsize > 0:
+                self._entries[key] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(0, maxsize):
+                self._entries.popitem(last=False)
+
+    def info(self) -> ConversionCacheInfo:
+        with self._lock:
+            return ConversionCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+_conversion_cache = _ConversionCache(maxsize=1024)
+
+
+def conversion_cache_info() -> ConversionCacheInfo:
+    return _conversion_cache.info()
+
+
+def conversion_cache_clear():
+    _conversion_cache.clear()
+
+
+def set_conversion_cache_size(maxsize: int):
+    # 0 disables the cache
+    _conversion_cache.resize(maxsize)
+
+
+def _experiment_key(kind: str, experiment: QasmQobjExperiment, optimization_level: int,
+                    qubit_mapping: Optional[Dict[int, int]]) -> str:
+    # Everything the conversion depends on: the instructions with their parameters and the measurement mapping
+    instructions: List[Any] = [
+        [i.name, i.qubits, getattr(i, 'params', []), getattr(i, 'memory', [])] for i in experiment.instructions
+    ]
+    key = json.dumps([kind, optimization_level, sorted((qubit_mapping or {}).items()), instructions], default=repr)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def convert_experiment(experiment: QasmQobjExperiment, optimization_level: int = 1,
+                       qubit_mapping: Optional[Dict[int, int]] = None) -> Circuit:
+    def convert() -> Tuple[Operation, ...]:
+        return tuple(optimize_operations(experiment_2_operations(experiment, qubit_mapping=qubit_mapping),
+                                         optimization_level=optimization_level))
+
+    operations = _conversion_cache.get(_experiment_key('operations', experiment, optimization_level, qubit_mapping),
+                                       convert)
+    return operations_2_circuit(list(operations))
+
+
+def convert_qasm_qobj(qobj: QasmQobj, optimization_level: int = 1,
+                      qubit_mapping: Optional[Dict[int, int]] = None) -> Iterable[Circuit]:
+    experiment: QasmQobjExperiment
+    for experiment in qobj.experiments:
+        yield convert_experiment(experiment, optimization_level=optimization_level, qubit_mapping=qubit_mapping)
+
+
+def convert_experiment_jaqcd(experiment: QasmQobjExperiment, optimization_level: int = 1,
+                             qubit_mapping: Optional[Dict[int, int]] = None) -> JaqcdProgram:
+    def convert() -> JaqcdProgram:
+        operations = optimize_operations(experiment_2_operations(experiment, qubit_mapping=qubit_mapping),
+                                         optimization_level=optimization_level)
+        return operations_2_jaqcd(operations)
+
+    return _conversion_cache.get(_experiment_key('jaqcd', experiment, optimization_level, qubit_mapping), convert)
+
+
+def convert_qasm_qobj_jaqcd(qobj: QasmQobj, optimization_level: int = 1,
+                            qubit_mapping: Optional[Dict[int, int]] = None) -> Iterable[JaqcdProgram]:
     experiment: QasmQobjExperiment
     for experiment in qobj.experiments:
-        yield convert_experiment(experiment)
\ No newline at end of file
+        yield convert_experiment_jaqcd(experiment, optimization_level=optimization_level,
+                                       qubit_mapping=qubit_mapping)
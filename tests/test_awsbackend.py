@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import logging
 import time
 import unittest
@@ -20,9 +21,11 @@ import boto3
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile, assemble
 from qiskit.circuit.measure import measure
 from qiskit.providers import JobStatus
+from qiskit.qobj import QasmQobj
 
 from qiskit_aws_braket_provider.awsbackend import AWSBackend
 from qiskit_aws_braket_provider.awsprovider import AWSProvider
+from qiskit_aws_braket_provider.transpilation import convert_qasm_qobj
 
 LOG = logging.getLogger(__name__)
 
@@ -33,24 +36,31 @@ class AWSBackendTests(unittest.TestCase):
 
     def setUp(self) -> None:
         logging.basicConfig(format=logging.BASIC_FORMAT, level='INFO')
-        self.provider: AWSProvider = AWSProvider(region_name='us-east-1')
+        self.provider: AWSProvider = AWSProvider(region_name='us-east-1', job_index_path=':memory:')
         self.backend: AWSBackend = self.provider.get_backend(self.backend_name)
 
     def test_get_job_data_s3_folder(self):
         key = self.backend._get_job_data_s3_folder('12345')
         self.assertEqual(key, f'results-{self.backend_name}-12345')
 
-    def test_save_job_task_arns(self):
+    def test_load_job_task_arns_missing(self):
+        with self.assertRaises(ValueError):
+            self.backend._load_job_task_arns(job_id=str(uuid.uuid4()))
+
+    def test_save_job_manifest_s3(self):
         job_id = str(uuid.uuid4())
-        task_arns = ['537a196e-8162-41c6-8c72-a7f8b456da31', '537a196e-8162-41c6-8c72-a7f8b456da32',
-                   '537a196e-8162-41c6-8c72-a7f8b456da33', '537a196e-8162-41c6-8c72-a7f8b456da34']
-        s3_bucket, s3_folder = self.backend._save_job_task_arns(job_id, task_arns)
-        self.assertTrue(
-            AWSBackend._exists_file(self.provider._session.client('s3'), s3_bucket, f'{s3_folder}/task_arns.json')
-        )
-        self.backend._delete_job_task_arns(job_id=job_id, s3_bucket=s3_bucket)
+        manifest = {
+            'version': 1,
+            'job_id': job_id,
+            'qobj': {},
+            'extra_data': {'test': ['yes', 'is', 'there']},
+            'task_arns': ['537a196e-8162-41c6-8c72-a7f8b456da31']
+        }
+        s3_bucket, _ = self.backend._save_job_manifest_s3(job_id, manifest)
+        self.assertDictEqual(self.backend._load_job_manifest_s3(job_id), manifest)
+        self.backend._delete_job_manifest_s3(job_id=job_id, s3_bucket=s3_bucket)
 
-    def test_save_job_data_s3(self):
+    def test_save_job_manifest_s3_qobj(self):
         creg = ClassicalRegister(2)
         qreg = QuantumRegister(2)
         qc = QuantumCircuit(qreg, creg, name='test')
@@ -58,20 +68,54 @@ class AWSBackendTests(unittest.TestCase):
         qc.cx(0, 1)
         measure(qc, qreg, creg)
         qobj = assemble(10 * [qc])
-
-        extra_data = {
-            'test': [
-                'yes', 'is', 'there'
-            ]
+        manifest = {
+            'version': 1,
+            'job_id': qobj.qobj_id,
+            'qobj': qobj.to_dict(),
+            'extra_data': {'test': ['yes', 'is', 'there']},
+            'task_arns': []
         }
 
-        s3_bucket, s3_key = self.backend._save_job_data_s3(qobj=qobj, s3_bucket=None, extra_data=extra_data)
+        s3_bucket, s3_folder = self.backend._save_job_manifest_s3(qobj.qobj_id, manifest)
         self.assertEqual(s3_bucket, self.backend.provider().get_default_bucket())
-        self.assertEqual(s3_key, f'results-{self.backend_name}-{qobj.qobj_id}')
-        self.assertTrue(
-            AWSBackend._exists_file(self.provider._session.client('s3'), s3_bucket, f'{s3_key}/qiskit_qobj_data.json')
+        self.assertEqual(s3_folder, f'results-{self.backend_name}-{qobj.qobj_id}')
+        loaded_manifest = self.backend._load_job_manifest_s3(qobj.qobj_id)
+        self.assertEqual(QasmQobj.from_dict(loaded_manifest['qobj']).qobj_id, qobj.qobj_id)
+        self.assertListEqual(loaded_manifest['extra_data']['test'], ['yes', 'is', 'there'])
+        self.backend._delete_job_manifest_s3(job_id=qobj.qobj_id, s3_bucket=s3_bucket)
+
+    def test_save_job_manifest_s3_twice(self):
+        job_id = str(uuid.uuid4())
+        manifest = {'version': 1, 'job_id': job_id, 'qobj': {}, 'task_arns': []}
+        s3_bucket, _ = self.backend._save_job_manifest_s3(job_id, manifest)
+        with self.assertRaises(ValueError):
+            self.backend._save_job_manifest_s3(job_id, manifest)
+        self.backend._delete_job_manifest_s3(job_id=job_id, s3_bucket=s3_bucket)
+        # deleting is idempotent
+        self.backend._delete_job_manifest_s3(job_id=job_id, s3_bucket=s3_bucket)
+
+    def test_load_job_manifest_s3_submitting(self):
+        job_id = str(uuid.uuid4())
+        manifest = {'version': 1, 'job_id': job_id, 'submitting': True}
+        s3_bucket, _ = self.backend._save_job_manifest_s3(job_id, manifest)
+        with self.assertRaises(ValueError):
+            self.backend._load_job_manifest_s3(job_id)
+        # the reserved manifest is completed once the tasks are submitted
+        manifest = {'version': 1, 'job_id': job_id, 'qobj': {}, 'task_arns': []}
+        self.backend._save_job_manifest_s3(job_id, manifest, overwrite=True)
+        self.assertDictEqual(self.backend._load_job_manifest_s3(job_id), manifest)
+        self.backend._delete_job_manifest_s3(job_id=job_id, s3_bucket=s3_bucket)
+
+    def test_load_job_manifest_s3_legacy(self):
+        job_id = '2020-09-17T18:47:48.653735-60f7a533-a5d5-481c-9671-681f4823ce25'
+        manifest = self.backend._load_job_manifest_s3(job_id=job_id)
+        self.assertEqual(manifest['version'], 0)
+        self.assertEqual(manifest['qobj']['qobj_id'], '66da2c50-2e5c-47aa-81c5-d47a04df804c')
+        self.assertListEqual(manifest['extra_data']['test'], ['yes', 'is', 'there'])
+        self.assertListEqual(
+            manifest['task_arns'], ['537a196e-8162-41c6-8c72-a7f8b456da31', '537a196e-8162-41c6-8c72-a7f8b456da32',
+                                    '537a196e-8162-41c6-8c72-a7f8b456da33', '537a196e-8162-41c6-8c72-a7f8b456da34']
         )
-        self.backend._delete_job_data_s3(job_id=qobj.qobj_id, s3_bucket=None)
 
     def test_load_job_task_arns(self):
         job_id = '2020-09-17T18:47:48.653735-60f7a533-a5d5-481c-9671-681f4823ce25'
@@ -81,13 +125,6 @@ class AWSBackendTests(unittest.TestCase):
                    '537a196e-8162-41c6-8c72-a7f8b456da33', '537a196e-8162-41c6-8c72-a7f8b456da34']
         )
 
-    def test_load_job_data_s3(self):
-        job_id = '2020-09-17T18:47:48.653735-60f7a533-a5d5-481c-9671-681f4823ce25'
-        qobj, extra_data = self.backend._load_job_data_s3(job_id=job_id)
-        self.assertEqual(qobj.qobj_id, '66da2c50-2e5c-47aa-81c5-d47a04df804c')
-        self.assertTrue('test' in extra_data)
-        self.assertListEqual(extra_data['test'], ['yes', 'is', 'there'])
-
     def test_compile(self):
         creg = ClassicalRegister(2)
         qreg = QuantumRegister(2)
@@ -108,6 +145,14 @@ class AWSBackendTests(unittest.TestCase):
         self.assertEqual(job.job_id(), job_id)
         self.assertEqual(job.status(), JobStatus.DONE)
 
+    def test_retrieve_jobs(self):
+        job_ids = ['52284ef5-1cf7-4182-9547-5bbc7c5dd9f5', 'does-not-exist', '66b6a642-7db3-4134-8181-f7039b56fdfd']
+        jobs = self.backend.retrieve_jobs(job_ids, max_workers=3)
+        self.assertEqual(len(jobs), len(job_ids))
+        self.assertEqual(jobs[0].job_id(), job_ids[0])
+        self.assertIsInstance(jobs[1], ValueError)
+        self.assertEqual(jobs[2].job_id(), job_ids[2])
+
     def test_retrieve_job_cancelled(self):
         job_id = '66b6a642-7db3-4134-8181-f7039b56fdfd'
         job = self.backend.retrieve_job(job_id)
@@ -141,3 +186,118 @@ class AWSBackendTests(unittest.TestCase):
         while job.status() != JobStatus.QUEUED:
             time.sleep(1)
         job.cancel()
+
+    def test_run_concurrent_submission(self):
+        creg = ClassicalRegister(2)
+        qreg = QuantumRegister(2)
+        qc = QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        measure(qc, qreg, creg)
+
+        qc_transpiled = transpile(qc, self.backend)
+        qobj = assemble(3 * [qc_transpiled], self.backend, shots=1)
+
+        job = self.backend.run(qobj, max_workers=2)
+        LOG.info(job.job_id())
+
+        self.assertEqual(len(job.tasks), len(qobj.experiments))
+        self.assertListEqual(
+            [t.id for t in job.tasks], self.backend._load_job_manifest_s3(job_id=job.job_id())['task_arns']
+        )
+        job.cancel()
+
+    def test_run_async(self):
+        creg = ClassicalRegister(2)
+        qreg = QuantumRegister(2)
+        qc = QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        measure(qc, qreg, creg)
+
+        qc_transpiled = transpile(qc, self.backend)
+        qobjs = [assemble(qc_transpiled, self.backend, shots=1) for _ in range(3)]
+
+        async def run_all():
+            jobs = await asyncio.gather(*[self.backend.run_async(qobj) for qobj in qobjs])
+            return jobs, await asyncio.gather(*[job.status_async() for job in jobs])
+
+        jobs, statuses = asyncio.get_event_loop().run_until_complete(run_all())
+        self.assertListEqual([job.job_id() for job in jobs], [qobj.qobj_id for qobj in qobjs])
+        self.assertTrue(all([status in [JobStatus.INITIALIZING, JobStatus.QUEUED] for status in statuses]))
+        for job in jobs:
+            job.cancel()
+
+    def test_run_direct_ir(self):
+        creg = ClassicalRegister(2)
+        qreg = QuantumRegister(2)
+        qc = QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        measure(qc, qreg, creg)
+
+        qc_transpiled = transpile(qc, self.backend)
+        qobj = assemble(2 * [qc_transpiled], self.backend, shots=1)
+
+        job = self.backend.run(qobj, direct_ir=True)
+        LOG.info(job.job_id())
+
+        self.assertEqual(len(job.tasks), len(qobj.experiments))
+        self.assertTrue(job.status() in [JobStatus.INITIALIZING, JobStatus.QUEUED])
+        job.cancel()
+
+    def test_run_deduplicate(self):
+        creg = ClassicalRegister(2)
+        qreg = QuantumRegister(2)
+        qc = QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        measure(qc, qreg, creg)
+
+        qc_transpiled = transpile(qc, self.backend)
+        qobj = assemble(3 * [qc_transpiled], self.backend, shots=1)
+
+        job = self.backend.run(qobj, deduplicate=True)
+        LOG.info(job.job_id())
+
+        self.assertEqual(len(job.tasks), 1)
+        self.assertEqual(job._experiment_slices, [[(0, 0, 1)], [(0, 1, 2)], [(0, 2, 3)]])
+        job.cancel()
+
+    def test_plan_tasks_split_shots(self):
+        creg = ClassicalRegister(2)
+        qreg = QuantumRegister(2)
+        qc = QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        measure(qc, qreg, creg)
+        circuits = list(convert_qasm_qobj(assemble(2 * [transpile(qc, self.backend)], self.backend)))
+
+        max_shots = self.backend.configuration().max_shots
+        task_specifications, experiment_slices = self.backend._plan_tasks(
+            circuits, 2 * max_shots + 1, deduplicate=False
+        )
+        self.assertListEqual([s for _, s in task_specifications], 2 * [max_shots, max_shots, 1])
+        self.assertListEqual(experiment_slices, [[(0, None, None), (1, None, None), (2, None, None)],
+                                                 [(3, None, None), (4, None, None), (5, None, None)]])
+
+    def test_jobs(self):
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        self.backend.retrieve_job(job_id).status()
+        jobs = self.backend.jobs(limit=None, status=JobStatus.DONE)
+        self.assertIn(job_id, [j.job_id() for j in jobs])
+
+    def test_job_id_of_task(self):
+        job_id = str(uuid.uuid4())
+        task_summary = {
+            'quantumTaskArn': 'arn:aws:braket:us-east-1:123456789012:quantum-task/537a196e',
+            'outputS3Bucket': 'amazon-braket-123456789012',
+            'outputS3Directory': f'{self.backend._get_job_data_s3_folder(job_id)}/537a196e'
+        }
+        self.assertEqual(self.backend._job_id_of_task(task_summary), job_id)
+        self.assertIsNone(self.backend._job_id_of_task({'outputS3Directory': 'tasks/537a196e'}))
+
+    def test_active_jobs(self):
+        jobs = self.backend.active_jobs(limit=5)
+        self.assertLessEqual(len(jobs), 5)
+        LOG.info([j.job_id() for j in jobs])
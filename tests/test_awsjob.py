@@ -11,16 +11,21 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import logging
+import threading
 import unittest
 from collections import Counter
 
 import boto3
-from qiskit.qobj import QasmQobjExperiment, QasmQobjInstruction
+import numpy
+from qiskit.providers import JobStatus
+from qiskit.qobj import QasmQobj, QasmQobjConfig, QasmQobjExperiment, QasmQobjInstruction
 from qiskit.result import Result
 
 from qiskit_aws_braket_provider.awsbackend import AWSBackend
-from qiskit_aws_braket_provider.awsjob import AWSJob, _reverse_and_map, map_measurements
+from qiskit_aws_braket_provider.awsjob import AWSJob, LazyQuantumTask, TaskSlice, _reverse_and_map, map_measurements, \
+    map_measurement_array, probabilities_2_counts
 from qiskit_aws_braket_provider.awsprovider import AWSProvider
 
 LOG = logging.getLogger(__name__)
@@ -29,7 +34,7 @@ LOG = logging.getLogger(__name__)
 class AWSJobTests(unittest.TestCase):
 
     def _load_backend(self):
-        self.provider = AWSProvider(region_name='us-east-1')
+        self.provider = AWSProvider(region_name='us-east-1', job_index_path=':memory:')
         self.ionq_backend: AWSBackend = self.provider.get_backend('IonQ Device')
 
     def setUp(self) -> None:
@@ -45,6 +50,14 @@ class AWSJobTests(unittest.TestCase):
         self.assertEqual(counts, counts_get_item)
         self.assertEqual(counts['00'], 1)
 
+    def test_result_max_workers(self):
+        self._load_backend()
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        job: AWSJob = self.ionq_backend.retrieve_job(job_id=job_id)
+        result_sequential: Result = job.result(max_workers=1)
+        result_concurrent: Result = job.result(max_workers=4)
+        self.assertEqual(result_sequential.get_counts(), result_concurrent.get_counts())
+
     def test_reverse_and_map(self):
         mapping = {0: 2, 1: 3, 2: 0, 3:1}
         adjusted_bit_string = _reverse_and_map('abcd', mapping)
@@ -79,3 +92,168 @@ class AWSJobTests(unittest.TestCase):
         self.assertEqual(new_counts['00'], 10 + 3 + 5)
         self.assertEqual(new_counts['11'], 7 + 1)
         self.assertEqual(new_counts['10'], 2)
+
+    def test_map_measurements_identity(self):
+        counts = Counter({'001': 4, '110': 6})
+        qasm_experiment = QasmQobjExperiment(
+            instructions=[QasmQobjInstruction(name='measure', qubits=[0, 1, 2], memory=[0, 1, 2])]
+        )
+        new_counts = map_measurements(counts, qasm_experiment)
+        self.assertDictEqual(new_counts, {'100': 4, '011': 6})
+
+    def test_map_measurements_measured_qubits(self):
+        counts = Counter({'01': 3, '11': 2, '10': 1})
+        # braket only reports the qubits 0 and 2, qubit 2 is measured into the first classical bit
+        qasm_experiment = QasmQobjExperiment(
+            instructions=[QasmQobjInstruction(name='measure', qubits=[2, 0], memory=[0, 1])]
+        )
+        new_counts = map_measurements(counts, qasm_experiment, measured_qubits=[0, 2])
+        self.assertDictEqual(new_counts, {'01': 3, '11': 2, '10': 1})
+
+    def test_map_measurement_array(self):
+        # one row per shot, one column per measured qubit
+        measurements = numpy.array([[0, 0, 0], [0, 1, 1], [1, 0, 1], [0, 1, 1]])
+        qasm_experiment = QasmQobjExperiment(
+            instructions=[
+                QasmQobjInstruction(name='measure', qubits=[0], memory=[1]),
+                QasmQobjInstruction(name='measure', qubits=[2], memory=[0])
+            ]
+        )
+        new_counts = map_measurement_array(measurements, qasm_experiment)
+        self.assertDictEqual(new_counts, {'00': 1, '01': 2, '11': 1})
+        self.assertDictEqual(new_counts, map_measurements(Counter({'000': 1, '011': 2, '101': 1}), qasm_experiment))
+
+    def test_probabilities_2_counts(self):
+        self.assertDictEqual(probabilities_2_counts({'00': 0.5, '11': 0.5}, 4), {'00': 2, '11': 2})
+        counts = probabilities_2_counts({'00': 0.6, '01': 0.3, '11': 0.1}, 7)
+        self.assertEqual(sum(counts.values()), 7)
+        self.assertDictEqual(counts, {'00': 4, '01': 2, '11': 1})
+
+    def test_experiment_result_probabilities_only(self):
+        class ProbabilitiesResult(object):
+            # as an IonQ result: the measurements are rebuilt from the probabilities, grouped by bit string
+            measured_qubits = [0, 1]
+            measurements_copied_from_device = False
+            measurement_probabilities = {'00': 0.5, '11': 0.5}
+            measurements = numpy.array(3 * [[0, 0]] + 3 * [[1, 1]])
+
+        qasm_experiment = QasmQobjExperiment(
+            instructions=[QasmQobjInstruction(name='measure', qubits=[0, 1], memory=[0, 1])]
+        )
+        qobj = QasmQobj(qobj_id='job', config=QasmQobjConfig(shots=3), experiments=2 * [qasm_experiment])
+        # both experiments were deduplicated into one task of 6 shots
+        experiment_slices = [[TaskSlice(0, 0, 3)], [TaskSlice(0, 3, 6)]]
+        job = AWSJob(job_id='job', qobj=qobj, backend=None, tasks=[], experiment_slices=experiment_slices)
+        for task_slices in experiment_slices:
+            experiment_result = job._experiment_result(qasm_experiment, task_slices, [ProbabilitiesResult()],
+                                                       ['COMPLETED'])
+            self.assertEqual(sum(experiment_result.data.counts.values()), 3)
+            self.assertEqual(set(experiment_result.data.counts.keys()), {'00', '11'})
+
+    def test_task_states(self):
+        self._load_backend()
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        job: AWSJob = self.ionq_backend.retrieve_job(job_id=job_id)
+        states = job.task_states()
+        self.assertTrue(all([s == 'COMPLETED' for s in states]))
+        # final states are kept, even if the snapshot is refreshed
+        self.assertListEqual(job.task_states(max_age=0), states)
+        self.assertEqual(job.status(), JobStatus.DONE)
+        self.assertDictEqual(job.pending_tasks(), {})
+
+    def test_iter_results(self):
+        self._load_backend()
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        job: AWSJob = self.ionq_backend.retrieve_job(job_id=job_id)
+        result: Result = job.result()
+        streamed = dict(job.iter_results(max_workers=2))
+        self.assertListEqual(sorted(streamed.keys()), list(range(len(result.results))))
+        for i, experiment_result in streamed.items():
+            self.assertDictEqual(experiment_result.data.counts, result.results[i].data.counts)
+
+        async def collect():
+            return dict([(i, r) async for i, r in job.aiter_results()])
+
+        self.assertListEqual(sorted(asyncio.get_event_loop().run_until_complete(collect()).keys()),
+                             sorted(streamed.keys()))
+
+    def test_partial_result(self):
+        self._load_backend()
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        job: AWSJob = self.ionq_backend.retrieve_job(job_id=job_id)
+        partial_result: Result = job.partial_result()
+        self.assertTrue(partial_result.success)
+        self.assertEqual(len(partial_result.results), len(job.result().results))
+
+    def test_lazy_quantum_task(self):
+        arns = []
+        arn = 'arn:aws:braket:us-east-1:123456789012:quantum-task/537a196e-8162-41c6-8c72-a7f8b456da31'
+        task = LazyQuantumTask(arn, lambda a: arns.append(a))
+        self.assertEqual(task.id, arn)
+        self.assertListEqual(arns, [])
+
+    def test_retrieve_job_lazy(self):
+        self._load_backend()
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        job: AWSJob = self.ionq_backend.retrieve_job(job_id=job_id)
+        self.assertIsNone(job._qobj_value)
+        self.assertTrue(all([t._task is None for t in job.tasks]))
+        self.assertEqual(job.status(), JobStatus.DONE)
+        self.assertIsNone(job._qobj_value)
+        self.assertEqual(job._qobj.qobj_id, job_id)
+
+    def test_job_data_loader(self):
+        loads = []
+
+        def load() -> dict:
+            loads.append(1)
+            return {'extra_data': {'a': 1}, 'qubit_mapping': {0: 3}}
+
+        arn = 'arn:aws:braket:us-east-1:123456789012:quantum-task/537a196e-8162-41c6-8c72-a7f8b456da31'
+        tasks = [LazyQuantumTask(arn, lambda a: None), LazyQuantumTask(arn, lambda a: None)]
+        job = AWSJob(job_id='job', qobj=None, backend=None, tasks=tasks, job_data_loader=load)
+        self.assertListEqual(loads, [])
+        self.assertDictEqual(job.extra_data, {'a': 1})
+        self.assertDictEqual(job.qubit_mapping, {0: 3})
+        self.assertListEqual(job._experiment_slices, [[TaskSlice(0)], [TaskSlice(1)]])
+        self.assertListEqual(loads, [1])
+
+    def test_jobs_lazy(self):
+        self._load_backend()
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        self.ionq_backend.retrieve_job(job_id=job_id).status()
+        jobs = [j for j in self.ionq_backend.jobs(limit=None, status=JobStatus.DONE) if j.job_id() == job_id]
+        self.assertEqual(len(jobs), 1)
+        job: AWSJob = jobs[0]
+        self.assertIsNotNone(job._job_data_loader)
+        self.assertTrue(all([t._task is None for t in job.tasks]))
+        self.assertEqual(job._qobj.qobj_id, job_id)
+        self.assertIsNone(job._job_data_loader)
+
+    def test_fetch_task_results_twice(self):
+        class CancelledTask(object):
+            def __init__(self, arn):
+                self.id = arn
+                self.polls = 0
+
+            def state(self, use_cached_value=False):
+                self.polls += 1
+                return 'CANCELLED'
+
+        tasks = [CancelledTask('task-0'), CancelledTask('task-1')]
+        job = AWSJob(job_id='job', qobj=None, backend=None, tasks=tasks, results_poll_interval=0)
+        # every call runs on the threads of a new executor
+        self.assertListEqual(job._fetch_task_results(max_workers=2), [None, None])
+        self.assertListEqual(job._fetch_task_results(max_workers=1), [None, None])
+        self.assertListEqual([t.polls for t in tasks], [1, 1])
+        self.assertListEqual(job.task_states(), ['CANCELLED', 'CANCELLED'])
+
+    def test_wait_for_final_state(self):
+        self._load_backend()
+        job_id = '52284ef5-1cf7-4182-9547-5bbc7c5dd9f5'
+        job: AWSJob = self.ionq_backend.retrieve_job(job_id=job_id)
+        done = threading.Event()
+        job.add_done_callback(lambda j: done.set())
+        self.assertEqual(job.wait_for_final_state(timeout=60), JobStatus.DONE)
+        self.assertTrue(done.wait(timeout=5))
+        self.assertListEqual(self.provider.job_monitor.watched_jobs, [])
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import logging
 import unittest
 
@@ -47,3 +48,50 @@ class AWSProviderTests(unittest.TestCase):
         provider = AWSProvider(region_name='us-east-1')
         ionq_backend: AWSBackend = provider.get_backend('SV1')
         LOG.info(ionq_backend)
+
+    def test_backend_cache(self):
+        provider = AWSProvider(region_name='us-east-1')
+        backend: AWSBackend = provider.get_backend('SV1')
+        self.assertIs(provider.get_backend('SV1'), backend)
+        provider.invalidate_backend_cache()
+        self.assertIsNot(provider.get_backend('SV1'), backend)
+
+    def test_backend_cache_stale(self):
+        provider = AWSProvider(region_name='us-east-1', backend_cache_ttl=0)
+        backend: AWSBackend = provider.get_backend('SV1')
+        # the cache is refreshed at once, but unchanged devices keep their backend
+        self.assertIs(provider.get_backend('SV1'), backend)
+
+    def test_get_default_bucket(self):
+        provider = AWSProvider(region_name='us-east-1')
+        bucket = provider.get_default_bucket()
+        self.assertEqual(bucket, f'amazon-braket-{provider._account_id}')
+        self.assertEqual(provider.get_default_bucket(refresh=True), bucket)
+
+    def test_clients_are_reused(self):
+        provider = AWSProvider(region_name='us-east-1')
+        self.assertIs(provider.get_s3_client(), provider.get_s3_client())
+        self.assertIs(provider._aws_session.braket_client, provider._get_client('braket'))
+        self.assertEqual(provider.get_s3_client().meta.config.max_pool_connections, 50)
+
+    def test_get_aws_session_for_arn(self):
+        provider = AWSProvider(region_name='us-east-1')
+        arn = 'arn:aws:braket:us-west-1:123456789012:quantum-task/537a196e-8162-41c6-8c72-a7f8b456da31'
+        aws_session = provider.get_aws_session_for_arn(arn)
+        self.assertEqual(aws_session.boto_session.region_name, 'us-west-1')
+        self.assertIs(provider.get_aws_session_for_arn(arn), aws_session)
+
+    def test_get_aws_session_for_arn_credentials(self):
+        session = boto3.session.Session(aws_access_key_id='key', aws_secret_access_key='secret',
+                                        region_name='us-east-1')
+        provider = AWSProvider(session=session)
+        arn = 'arn:aws:braket:us-west-1:123456789012:quantum-task/537a196e-8162-41c6-8c72-a7f8b456da31'
+        credentials = provider.get_aws_session_for_arn(arn).boto_session.get_credentials()
+        self.assertEqual(credentials.access_key, 'key')
+        self.assertEqual(credentials.secret_key, 'secret')
+
+    def test_backends_async(self):
+        provider = AWSProvider(region_name='us-east-1')
+        backends = asyncio.get_event_loop().run_until_complete(provider.backends_async(name='SV1'))
+        self.assertListEqual(backends, provider.backends(name='SV1'))
+        self.assertIs(provider.executor, provider.executor)
@@ -18,7 +18,8 @@ import boto3
 from braket.aws import AwsDevice
 from qiskit.providers.models import QasmBackendConfiguration
 
-from qiskit_aws_braket_provider.conversions_configuration import aws_device_2_configuration
+from qiskit_aws_braket_provider.conversions_configuration import aws_device_2_configuration, _qiskit_basis_gates, \
+    _native_gate_names
 
 LOG = logging.getLogger(__name__)
 
@@ -33,15 +34,41 @@ class TranspilationTests(unittest.TestCase):
         aws_device = AwsDevice.get_devices(names=['IonQ Device'])[0]
         configuration: QasmBackendConfiguration = aws_device_2_configuration(aws_device)
         self.assertIsInstance(configuration, QasmBackendConfiguration)
+        self.assertListEqual(configuration.basis_gates[:3], ['u1', 'u2', 'u3'])
+        self.assertIn('rxx', configuration.basis_gates)
+        self.assertIn('cx', configuration.basis_gates)
 
     def test_convert_experiment_aspen8(self):
         self.session = boto3.session.Session(region_name='us-west-1')
         aws_device = AwsDevice.get_devices(names=['Aspen-8'])[0]
         configuration = aws_device_2_configuration(aws_device)
         self.assertIsInstance(configuration, QasmBackendConfiguration)
+        self.assertIn('cz', configuration.basis_gates)
+        self.assertIn('cu1', configuration.basis_gates)
+        self.assertNotIn('phaseshift', configuration.basis_gates)
 
     def test_convert_experiment_sv1(self):
         self.session = boto3.session.Session(region_name='us-west-1')
         aws_device = AwsDevice.get_devices(names=['SV1'])[0]
         configuration = aws_device_2_configuration(aws_device)
         self.assertIsInstance(configuration, QasmBackendConfiguration)
+
+    def test_convert_experiment_aspen8_native_gates(self):
+        self.session = boto3.session.Session(region_name='us-west-1')
+        aws_device = AwsDevice.get_devices(names=['Aspen-8'])[0]
+        configuration = aws_device_2_configuration(aws_device, native_gates=True)
+        self.assertTrue(set(['rx', 'rz', 'cz']).issubset(configuration.basis_gates))
+        self.assertNotIn('u3', configuration.basis_gates)
+        device_qubits = [int(q) for q in aws_device.properties.paradigm.connectivity.connectivityGraph.keys()]
+        self.assertListEqual(list(configuration.coupling_canonical_2_device.values()), device_qubits)
+
+    def test_convert_experiment_ionq_native_gates(self):
+        self.session = boto3.session.Session(region_name='us-west-1')
+        aws_device = AwsDevice.get_devices(names=['IonQ Device'])[0]
+        configuration = aws_device_2_configuration(aws_device, native_gates=True)
+        self.assertTrue(set(['rx', 'ry', 'rxx']).issubset(configuration.basis_gates))
+
+    def test_qiskit_basis_gates(self):
+        native_gate_set = [_native_gate_names.get(g.lower(), g.lower()) for g in ['RX', 'RZ', 'CZ', 'CPHASE', 'XY']]
+        self.assertTupleEqual(_qiskit_basis_gates(native_gate_set), (['rx', 'rz', 'cz', 'cu1'], ['xy']))
+        self.assertTupleEqual(_qiskit_basis_gates(['gpi', 'gpi2', 'ms']), ([], ['gpi', 'gpi2', 'ms']))
@@ -0,0 +1,90 @@
+# Copyright 2020 Carsten Blank
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import unittest
+from datetime import datetime, timedelta
+
+from qiskit.providers import JobStatus
+
+from qiskit_aws_braket_provider.jobindex import JobIndex
+
+LOG = logging.getLogger(__name__)
+
+
+class JobIndexTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.basicConfig(format=logging.BASIC_FORMAT, level='INFO')
+        self.job_index = JobIndex(':memory:')
+        self.now = datetime.now()
+        for i in range(5):
+            self.job_index.add_job(
+                job_id=f'job-{i}',
+                backend_name='SV1' if i < 4 else 'IonQ Device',
+                status=JobStatus.DONE if i % 2 == 0 else JobStatus.QUEUED,
+                creation_date=self.now + timedelta(minutes=i),
+                task_arns=[f'task-{i}-0', f'task-{i}-1'],
+                job_name='sweep' if i < 2 else None,
+                job_tags=['a', 'b'] if i == 0 else ['a']
+            )
+
+    def test_get_job(self):
+        record = self.job_index.get_job('job-0')
+        self.assertEqual(record['backend_name'], 'SV1')
+        self.assertEqual(record['status'], JobStatus.DONE)
+        self.assertEqual(record['creation_date'], self.now)
+        self.assertListEqual(record['task_arns'], ['task-0-0', 'task-0-1'])
+        self.assertListEqual(record['job_tags'], ['a', 'b'])
+        self.assertIsNone(self.job_index.get_job('job-unknown'))
+
+    def test_find_jobs(self):
+        records = self.job_index.find_jobs(backend_name='SV1')
+        self.assertListEqual([r['job_id'] for r in records], ['job-3', 'job-2', 'job-1', 'job-0'])
+        records = self.job_index.find_jobs(backend_name='SV1', limit=2, skip=1, descending=False)
+        self.assertListEqual([r['job_id'] for r in records], ['job-1', 'job-2'])
+        records = self.job_index.find_jobs(status=[JobStatus.QUEUED, 'RUNNING'])
+        self.assertListEqual([r['job_id'] for r in records], ['job-3', 'job-1'])
+        records = self.job_index.find_jobs(job_name='sweep', start_datetime=self.now + timedelta(seconds=1))
+        self.assertListEqual([r['job_id'] for r in records], ['job-1'])
+
+    def test_find_jobs_tags(self):
+        records = self.job_index.find_jobs(job_tags=['a', 'b'], job_tags_operator='AND')
+        self.assertListEqual([r['job_id'] for r in records], ['job-0'])
+        records = self.job_index.find_jobs(job_tags=['b', 'c'], job_tags_operator='OR')
+        self.assertListEqual([r['job_id'] for r in records], ['job-0'])
+
+    def test_update_status(self):
+        self.job_index.update_status('job-1', JobStatus.DONE)
+        self.assertEqual(self.job_index.get_job('job-1')['status'], JobStatus.DONE)
+        records = self.job_index.find_jobs(db_filter={'status': 'DONE', 'backend_name': 'SV1'})
+        self.assertListEqual([r['job_id'] for r in records], ['job-2', 'job-1', 'job-0'])
+
+    def test_unknown_status(self):
+        self.job_index.add_job(job_id='job-x', backend_name='SV1', status=None, creation_date=None,
+                               task_arns=['task-x-0'])
+        record = self.job_index.get_job('job-x')
+        self.assertIsNone(record['status'])
+        self.assertIsNone(record['creation_date'])
+        records = self.job_index.find_jobs(backend_name='SV1', limit=None, status=[JobStatus.DONE, JobStatus.QUEUED])
+        self.assertNotIn('job-x', [r['job_id'] for r in records])
+        self.job_index.update_status('job-x', JobStatus.DONE)
+        records = self.job_index.find_jobs(backend_name='SV1', limit=None, status=JobStatus.DONE)
+        self.assertIn('job-x', [r['job_id'] for r in records])
+
+    def test_task_job_ids(self):
+        self.job_index.add_task_job_ids({'task-x': 'job-x'})
+        task_job_ids = self.job_index.get_task_job_ids(['task-0-1', 'task-3-0', 'task-x', 'task-unknown'])
+        self.assertDictEqual(task_job_ids, {'task-0-1': 'job-0', 'task-3-0': 'job-3', 'task-x': 'job-x'})
+        self.job_index.remove_job('job-0')
+        self.assertDictEqual(self.job_index.get_task_job_ids(['task-0-1']), {})
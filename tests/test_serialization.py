@@ -0,0 +1,61 @@
+# Copyright 2020 Carsten Blank
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import logging
+import pickle
+import unittest
+
+from qiskit_aws_braket_provider import serialization
+
+LOG = logging.getLogger(__name__)
+
+
+class SerializationTests(unittest.TestCase):
+
+    data = {
+        'qobj_id': '66da2c50-2e5c-47aa-81c5-d47a04df804c',
+        'task_arns': ['537a196e-8162-41c6-8c72-a7f8b456da31', '537a196e-8162-41c6-8c72-a7f8b456da32'],
+        'extra_data': {'test': ['yes', 'is', 'there'], 'value': 0.5}
+    }
+
+    def setUp(self) -> None:
+        logging.basicConfig(format=logging.BASIC_FORMAT, level='INFO')
+
+    def test_encode_decode(self):
+        codecs = ['json', 'json+gzip']
+        if serialization.zstandard is not None:
+            codecs += ['json+zstd']
+        if serialization.msgpack is not None:
+            codecs += ['msgpack', 'msgpack+gzip']
+        for codec in codecs:
+            raw = serialization.encode(self.data, codec)
+            LOG.info(f'{codec}: {len(raw)} bytes')
+            self.assertDictEqual(serialization.decode(raw), self.data)
+
+    def test_decode_plain_json(self):
+        raw = json.dumps(self.data).encode()
+        self.assertDictEqual(serialization.decode(raw), self.data)
+        self.assertListEqual(serialization.decode(json.dumps(self.data['task_arns']).encode()),
+                             self.data['task_arns'])
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            serialization.encode(self.data, 'json+unknown')
+
+    def test_register_encoding(self):
+        serialization.register_encoding('pickle', pickle.dumps, pickle.loads)
+        for codec in ['pickle', 'pickle+gzip']:
+            self.assertDictEqual(serialization.decode(serialization.encode(self.data, codec)), self.data)
+        with self.assertRaises(ValueError):
+            serialization.register_encoding('json', pickle.dumps, pickle.loads)
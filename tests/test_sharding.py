@@ -0,0 +1,80 @@
+# Copyright 2020 Carsten Blank
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import unittest
+
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile, assemble
+from qiskit.circuit.measure import measure
+
+from qiskit_aws_braket_provider.awsbackend import AWSBackend
+from qiskit_aws_braket_provider.awsprovider import AWSProvider
+from qiskit_aws_braket_provider.sharding import ShardedBackend, round_robin_policy, cost_policy, queue_depth_policy
+
+LOG = logging.getLogger(__name__)
+
+
+class ShardingTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.basicConfig(format=logging.BASIC_FORMAT, level='INFO')
+        self.provider: AWSProvider = AWSProvider(region_name='us-east-1')
+        self.backend: AWSBackend = self.provider.get_backend('SV1')
+
+    def _qobj(self, no_experiments: int):
+        creg = ClassicalRegister(2)
+        qreg = QuantumRegister(2)
+        qc = QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        measure(qc, qreg, creg)
+        return assemble(no_experiments * [transpile(qc, self.backend)], self.backend, shots=10)
+
+    def test_round_robin_policy(self):
+        assignment = round_robin_policy([self.backend, self.backend], self._qobj(5))
+        self.assertListEqual(assignment, [0, 1, 0, 1, 0])
+
+    def test_cost_policy(self):
+        assignment = cost_policy([self.backend, self.backend], self._qobj(4))
+        self.assertListEqual(assignment, [0, 1, 0, 1])
+
+    def test_queue_depth_policy(self):
+        depth = self.backend.queue_depth()
+        self.assertGreaterEqual(depth, 0)
+        assignment = queue_depth_policy([self.backend, self.backend], self._qobj(4))
+        self.assertEqual(len(assignment), 4)
+        self.assertTrue(set(assignment) <= {0, 1})
+
+    def test_estimate_costs(self):
+        # SV1 is priced by the minute
+        self.assertGreater(self.backend.estimate_costs(self._qobj(2)), 0)
+
+    def test_shard_qobj(self):
+        sharded_backend = ShardedBackend([self.backend, self.backend, self.backend])
+        self.assertListEqual(sharded_backend._shard_qobj(self._qobj(5)), [[0, 3], [1, 4], [2]])
+
+    def test_run(self):
+        sharded_backend = ShardedBackend([self.backend, self.backend], policy='round_robin')
+        qobj = self._qobj(3)
+        job = sharded_backend.run(qobj)
+        self.assertEqual(len(job.shard_jobs), 2)
+        result = job.result()
+        self.assertEqual(len(result.results), 3)
+        self.assertEqual(result.qobj_id, qobj.qobj_id)
+
+    def test_run_empty_qobj(self):
+        sharded_backend = ShardedBackend([self.backend, self.backend])
+        qobj = self._qobj(1)
+        qobj.experiments = []
+        with self.assertRaises(ValueError):
+            sharded_backend.run(qobj)
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 import logging
 import unittest
 from typing import Dict
@@ -24,7 +25,9 @@ from braket.tasks.local_quantum_task import LocalQuantumTask
 from qiskit.providers.aer.backends.aerbackend import AerBackend
 from qiskit.result import Result
 
-from qiskit_aws_braket_provider.transpilation import convert_experiment
+from qiskit_aws_braket_provider.transpilation import convert_experiment, optimize_operations, Operation, \
+    experiment_2_operations, convert_experiment_jaqcd, convert_qasm_qobj, convert_qasm_qobj_jaqcd, \
+    conversion_cache_info, conversion_cache_clear
 
 LOG = logging.getLogger(__name__)
 
@@ -70,3 +73,170 @@ class TranspilationTests(unittest.TestCase):
         self.assertTrue(qiskit_counts.keys() == set([k[::-1] for k in braket_counts.keys()]))
         self.assertTrue(all(numpy.abs(c/100000 - 0.25) < 1e-2 for c in qiskit_counts.values()))
         self.assertTrue(all(numpy.abs(c/100000 - 0.25) < 1e-2 for c in braket_counts.values()))
+
+    def test_optimize_operations_fuse(self):
+        operations = [
+            Operation('rz', (0,), (0.5,)), Operation('rz', (0,), (0.25,)), Operation('i', (1,)),
+            Operation('rx', (1,), (0.0,)), Operation('rz', (1,), (numpy.pi,)), Operation('rz', (1,), (numpy.pi,))
+        ]
+        self.assertListEqual(optimize_operations(operations, optimization_level=1), [Operation('rz', (0,), (0.75,))])
+        self.assertListEqual(optimize_operations(operations, optimization_level=0), operations)
+
+    def test_optimize_operations_cancel(self):
+        operations = [
+            Operation('h', (0,)), Operation('cnot', (0, 1)), Operation('cnot', (0, 1)), Operation('h', (0,)),
+            Operation('cz', (0, 1)), Operation('cz', (1, 0)), Operation('cnot', (1, 2)), Operation('cnot', (2, 1))
+        ]
+        self.assertListEqual(optimize_operations(operations, optimization_level=2),
+                             [Operation('cnot', (1, 2)), Operation('cnot', (2, 1))])
+        self.assertListEqual(optimize_operations(operations, optimization_level=1), operations)
+
+    def test_optimize_operations_barrier(self):
+        operations = [Operation('x', (0,)), Operation('barrier', (0, 1)), Operation('x', (0,))]
+        self.assertListEqual(optimize_operations(operations, optimization_level=2), operations)
+
+    def test_convert_experiment_optimized(self):
+        qreg = qiskit.QuantumRegister(2)
+        creg = qiskit.ClassicalRegister(2)
+        qc = qiskit.QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.cx(0, 1)
+        qc.rz(0.5, 1)
+        qc.rz(-0.5, 1)
+        qiskit.circuit.measure.measure(qc, qreg, creg)
+        qc_transpiled = qiskit.transpile(qc, basis_gates=['u1', 'u2', 'u3', 'cx', 'id'], optimization_level=0)
+        experiment = qiskit.assemble(qc_transpiled, shots=1000).experiments[0]
+
+        aws_qc: Circuit = convert_experiment(experiment, optimization_level=2)
+        self.assertLess(len(aws_qc.instructions), len(convert_experiment(experiment, optimization_level=0).instructions))
+        self.assertLessEqual(len(aws_qc.instructions), 3)
+        self.assertEqual(len(experiment_2_operations(experiment)),
+                         len(convert_experiment(experiment, optimization_level=0).instructions) + 2)
+
+    def test_convert_experiment_standard_gates(self):
+        qreg = qiskit.QuantumRegister(3)
+        creg = qiskit.ClassicalRegister(3)
+        qc = qiskit.QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.sx(1)
+        qc.rx(0.3, 2)
+        qc.ry(0.4, 0)
+        qc.rz(0.5, 1)
+        qc.s(2)
+        qc.t(0)
+        qc.sdg(1)
+        qc.tdg(2)
+        qc.cx(0, 1)
+        qc.cy(1, 2)
+        qc.cz(2, 0)
+        qc.rxx(0.6, 0, 1)
+        qc.ryy(0.7, 1, 2)
+        qc.rzz(0.8, 2, 0)
+        qc.cu1(0.9, 0, 2)
+        qc.h(2)
+        qc.ccx(0, 1, 2)
+        qc.cswap(2, 0, 1)
+        qc.swap(0, 2)
+        probabilities = qiskit.quantum_info.Statevector.from_instruction(qc).probabilities()
+        qiskit.circuit.measure.measure(qc, qreg, creg)
+
+        qobj = qiskit.assemble(qc, shots=1)
+        aws_qc: Circuit = convert_experiment(qobj.experiments[0], optimization_level=0)
+        self.assertEqual(len(aws_qc.instructions), 20)
+
+        sim = LocalSimulator()
+        aws_qc_all = Circuit(aws_qc.instructions).probability()
+        braket_probabilities = sim.run(aws_qc_all, shots=0).result().values[0]
+        for i, p in enumerate(braket_probabilities):
+            # Braket has Big Endian, while qiskit uses Little Endian
+            self.assertAlmostEqual(p, probabilities[int(format(i, '03b')[::-1], 2)], places=6)
+
+    def test_experiment_2_operations_qubit_mapping(self):
+        qreg = qiskit.QuantumRegister(2)
+        creg = qiskit.ClassicalRegister(2)
+        qc = qiskit.QuantumCircuit(qreg, creg, name='test')
+        qc.rx(0.5, 0)
+        qc.cz(0, 1)
+        qiskit.circuit.measure.measure(qc, qreg, creg)
+        experiment = qiskit.assemble(qc, shots=1).experiments[0]
+
+        operations = experiment_2_operations(experiment, qubit_mapping={0: 10, 1: 17})
+        self.assertListEqual(operations, [
+            Operation('rx', (10,), (0.5,)), Operation('cz', (10, 17)),
+            Operation('measure', (10,)), Operation('measure', (17,))
+        ])
+
+    def test_convert_experiment_jaqcd(self):
+        creg = qiskit.ClassicalRegister(3)
+        qreg = qiskit.QuantumRegister(3)
+        qc = qiskit.QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.rxx(0.3, 1, 2)
+        qc.cu1(0.2, 2, 0)
+        qc.ccx(0, 2, 1)
+        qc.cswap(1, 0, 2)
+        qiskit.circuit.measure.measure(qc, qreg, creg)
+        experiment = qiskit.assemble(qc, shots=1).experiments[0]
+
+        program = convert_experiment_jaqcd(experiment)
+        circuit_program = json.loads(convert_experiment(experiment).to_ir().json())
+        self.assertListEqual(json.loads(program.action)['instructions'], circuit_program['instructions'])
+        self.assertListEqual(json.loads(program.action)['results'], circuit_program['results'])
+        self.assertEqual(program.qubit_count, 3)
+
+    def test_convert_qasm_qobj_jaqcd_large(self):
+        qreg = qiskit.QuantumRegister(8)
+        creg = qiskit.ClassicalRegister(8)
+        circuits = []
+        for n in range(20):
+            qc = qiskit.QuantumCircuit(qreg, creg, name=f'test-{n}')
+            for layer in range(50):
+                for q in range(8):
+                    qc.u3(0.1 * layer, 0.2 * q, 0.3 * n, q)
+                for q in range(layer % 2, 7, 2):
+                    qc.cx(q, q + 1)
+            qiskit.circuit.measure.measure(qc, qreg, creg)
+            circuits.append(qc)
+        qobj = qiskit.assemble(circuits, shots=1)
+        conversion_cache_clear()
+
+        braket_circuits = list(convert_qasm_qobj(qobj))
+        programs = list(convert_qasm_qobj_jaqcd(qobj))
+
+        self.assertEqual(len(programs), len(braket_circuits))
+        for program, circuit in zip(programs, braket_circuits):
+            action = circuit.to_ir().json()
+            self.assertEqual(program.qubit_count, circuit.qubit_count)
+            self.assertListEqual(json.loads(program.action)['instructions'], json.loads(action)['instructions'])
+            self.assertListEqual(json.loads(program.action)['results'], json.loads(action)['results'])
+
+    def test_conversion_cache(self):
+        qreg = qiskit.QuantumRegister(2)
+        creg = qiskit.ClassicalRegister(2)
+        qc = qiskit.QuantumCircuit(qreg, creg, name='test')
+        qc.h(0)
+        qc.cx(0, 1)
+        qiskit.circuit.measure.measure(qc, qreg, creg)
+        other_qc = qc.copy()
+        other_qc.rz(0.5, 1)
+        qobj = qiskit.assemble([qc, qc, other_qc], shots=1)
+        conversion_cache_clear()
+
+        circuits = list(convert_qasm_qobj(qobj))
+        self.assertEqual(conversion_cache_info().hits, 1)
+        self.assertEqual(conversion_cache_info().misses, 2)
+
+        # a new qobj (e.g. of the next run) with the same experiments
+        list(convert_qasm_qobj(qiskit.assemble([qc], shots=1)))
+        self.assertEqual(conversion_cache_info().hits, 2)
+        # other parameters are other programs
+        list(convert_qasm_qobj(qobj, optimization_level=0))
+        self.assertEqual(conversion_cache_info().misses, 4)
+        self.assertEqual(conversion_cache_info().currsize, 4)
+
+        # every caller gets its own circuit
+        circuits[0].probability()
+        self.assertEqual(len(list(convert_qasm_qobj(qobj))[1].result_types), len(circuits[1].result_types))
+        self.assertNotEqual(len(circuits[0].result_types), len(circuits[1].result_types))